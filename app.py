@@ -15,61 +15,64 @@ FIXES in v4.0:
 """
 
 import streamlit as st
-from PIL import Image, ImageDraw, ImageFont
-import qrcode
-import io, zipfile, csv, os, json
+from PIL import Image
+import io, zipfile, os, json, tempfile, html
+from urllib.parse import quote
 import pandas as pd
-import openpyxl
-from openpyxl.styles import Font as XFont, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
-from reportlab.pdfgen import canvas as pdf_canvas
-from reportlab.lib.pagesizes import landscape, A4
-from reportlab.lib.utils import ImageReader
 from datetime import datetime
+from cert_engine import (FONTS, generate_cert, names_to_pdf, generate_batch,
+                         prepare_template, template_hash, zip_add,
+                         DEFAULT_WORKERS, ZIP_MODES, PDF_MODES,
+                         cache_stats, render_cache_usage, clear_render_cache,
+                         preview_png, preview_pdf, preview_thumb, PREVIEW_WIDTH)
+from qr_engine import (make_qr, make_qr_batch, QR_FORMATS, ERROR_LEVELS,
+                       cert_id, verify_url)
+from cert_index import issue_certs, lookup_cert
+from excel_export import build_excel
+from reg_store import (save_registration, load_registrations, clear_registrations,
+                       is_registered, cached_export, category_counts,
+                       query_registrations, CSV_HEADERS, DUP_POLICIES,
+                       DEFAULT_EVENT, event_path, event_exists, list_events, create_event)
 
 # ─────────────────────────────────────────────────────────────────
 #  FILE PATHS  (server par save hote hain)
 # ─────────────────────────────────────────────────────────────────
-DATA_FILE   = "registrations.csv"   # sab registrations yahan save hongi
-CONFIG_FILE = "config.json"         # event info + URL yahan save hogi
+CONFIG_FILE = "config.json"         # app URL + active event yahan; event info har event ke folder mein
 
-CSV_HEADERS = ["name","roll_no","department","batch","category","event","date","time"]
+EXPORT_DIR  = os.path.join(tempfile.gettempdir(), "qr_cert_exports")   # bade ZIP disk par
+
+# Yeh settings har event ki alag hain — baaki (URL, active event) poori app ki
+EVENT_KEYS  = ("event_name", "event_date", "event_venue", "event_topic",
+               "organizer", "categories", "duplicate_policy")
 
 # ─────────────────────────────────────────────────────────────────
-#  CSV DATABASE FUNCTIONS
+#  CONFIG FUNCTIONS
 # ─────────────────────────────────────────────────────────────────
-def save_registration(rec: dict):
-    """Ek registration CSV mein append karo."""
-    file_exists = os.path.exists(DATA_FILE)
-    with open(DATA_FILE, "a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_HEADERS)
-        if not file_exists:
-            writer.writeheader()
-        writer.writerow({k: rec.get(k, "") for k in CSV_HEADERS})
-
-def load_registrations() -> list:
-    """Sab registrations CSV se load karo."""
-    if not os.path.exists(DATA_FILE):
-        return []
+def _read_json(path: str) -> dict:
     try:
-        with open(DATA_FILE, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            return [row for row in reader]
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
     except Exception:
-        return []
-
-def clear_registrations():
-    """Sab data delete karo."""
-    if os.path.exists(DATA_FILE):
-        os.remove(DATA_FILE)
+        return {}
 
 def save_config(cfg: dict):
-    """Config JSON mein save karo."""
+    """Config JSON mein save karo — cfg["event_id"] wale event ki settings
+    uske folder mein, app ki settings root config.json mein."""
+    eid  = cfg.get("event_id", DEFAULT_EVENT)
+    root = {k: v for k, v in cfg.items()
+            if k != "event_id" and (eid == DEFAULT_EVENT or k not in EVENT_KEYS)}
+    if eid != DEFAULT_EVENT:
+        with open(event_path(eid, CONFIG_FILE), "w", encoding="utf-8") as f:
+            json.dump({k: cfg[k] for k in EVENT_KEYS if k in cfg}, f, ensure_ascii=False, indent=2)
+    old  = _read_json(CONFIG_FILE)
+    root = {**old, **root}
+    if "event_name" in cfg:         # event picker sab naam yahin se padhta hai
+        root["event_names"] = {**old.get("event_names", {}), eid: cfg["event_name"]}
     with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-        json.dump(cfg, f, ensure_ascii=False, indent=2)
+        json.dump(root, f, ensure_ascii=False, indent=2)
 
-def load_config() -> dict:
-    """Config load karo, agar nahi hai to defaults."""
+def load_config(event_id: str = None) -> dict:
+    """Config load karo (event_id na do to active event), jo nahi hai woh defaults."""
     defaults = {
         "event_name":  "Certificate of Participation",
         "event_date":  datetime.now().strftime("%Y-%m-%d"),
@@ -78,16 +81,31 @@ def load_config() -> dict:
         "organizer":   "",
         "categories":  "Participant,Management",
         "app_url":     "",
+        "duplicate_policy": "reject",
+        "active_event": DEFAULT_EVENT,
     }
-    if not os.path.exists(CONFIG_FILE):
-        return defaults
-    try:
-        with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-            saved = json.load(f)
-        defaults.update(saved)
-        return defaults
-    except Exception:
-        return defaults
+    cfg = {**defaults, **_read_json(CONFIG_FILE)}
+    eid = event_id or cfg["active_event"]
+    if not event_exists(eid):
+        eid = DEFAULT_EVENT
+    if eid != DEFAULT_EVENT:        # root mein default event ki settings hain — yeh event apni
+        cfg.update({k: defaults[k] for k in EVENT_KEYS})
+        cfg.update({k: v for k, v in _read_json(event_path(eid, CONFIG_FILE)).items()
+                    if k in EVENT_KEYS})
+    cfg["event_id"] = eid
+    return cfg
+
+def event_names(events: list) -> dict:
+    """event_id -> naam, root config.json ki ek file se (har event ka config nahi).
+
+    Purane events jin ka naam wahan nahi, ek baar unke config se bhar diye jate hain.
+    """
+    names   = _read_json(CONFIG_FILE).get("event_names", {})
+    missing = {e: load_config(e)["event_name"] for e in events if e not in names}
+    if missing:
+        names = {**names, **missing}
+        save_config({"event_names": names})
+    return names
 
 # ─────────────────────────────────────────────────────────────────
 #  PAGE CONFIG
@@ -158,8 +176,11 @@ SESS_DEFAULTS = {
     "admin_auth":     False,
     "admin_password": "admin123",
     "template_bytes": None,
-    "qr_data":        None,
+    "template_hash":  None,
+    "template_file":  None,
+    "zip_path":       None,
     # from config file
+    "event_id":       cfg_file["event_id"],
     "event_name":     cfg_file["event_name"],
     "event_date":     cfg_file["event_date"],
     "event_venue":    cfg_file["event_venue"],
@@ -167,12 +188,17 @@ SESS_DEFAULTS = {
     "organizer":      cfg_file["organizer"],
     "categories":     cfg_file["categories"],
     "app_url":        cfg_file["app_url"],
+    "duplicate_policy": cfg_file["duplicate_policy"],
     # text settings
     "text_x":         50,
     "text_y":         60,
     "font_size":      72,
     "text_color":     "#1a1a1a",
     "selected_font":  "Arial Bold",
+    # verification QR (certificate par) — size 0 = band
+    "qr_size":        8,
+    "qr_x":           90,
+    "qr_y":           84,
 }
 for k, v in SESS_DEFAULTS.items():
     if k not in st.session_state:
@@ -181,65 +207,6 @@ for k, v in SESS_DEFAULTS.items():
 # ─────────────────────────────────────────────────────────────────
 #  FONTS
 # ─────────────────────────────────────────────────────────────────
-FONTS = {
-    "Arial Regular":          ["arial.ttf",        "DejaVuSans.ttf"],
-    "Arial Bold":             ["arialbd.ttf",       "DejaVuSans-Bold.ttf"],
-    "Arial Italic":           ["ariali.ttf",        "DejaVuSans-Oblique.ttf"],
-    "Arial Bold Italic":      ["arialbi.ttf",       "DejaVuSans-BoldOblique.ttf"],
-    "Calibri Regular":        ["calibri.ttf",       "DejaVuSans.ttf"],
-    "Calibri Bold":           ["calibrib.ttf",      "DejaVuSans-Bold.ttf"],
-    "Calibri Italic":         ["calibrii.ttf",      "DejaVuSans-Oblique.ttf"],
-    "Tahoma Regular":         ["tahoma.ttf",        "DejaVuSans.ttf"],
-    "Tahoma Bold":            ["tahomabd.ttf",      "DejaVuSans-Bold.ttf"],
-    "Verdana Regular":        ["verdana.ttf",       "DejaVuSans.ttf"],
-    "Verdana Bold":           ["verdanab.ttf",      "DejaVuSans-Bold.ttf"],
-    "Trebuchet MS":           ["trebuc.ttf",        "DejaVuSans.ttf"],
-    "Trebuchet Bold":         ["trebucbd.ttf",      "DejaVuSans-Bold.ttf"],
-    "Segoe UI":               ["segoeui.ttf",       "DejaVuSans.ttf"],
-    "Segoe UI Bold":          ["segoeuib.ttf",      "DejaVuSans-Bold.ttf"],
-    "Segoe UI Light":         ["segoeuil.ttf",      "DejaVuSans.ttf"],
-    "Times New Roman":        ["times.ttf",         "DejaVuSerif.ttf"],
-    "Times New Roman Bold":   ["timesbd.ttf",       "DejaVuSerif-Bold.ttf"],
-    "Times New Roman Italic": ["timesi.ttf",        "DejaVuSerif-Italic.ttf"],
-    "Times NR Bold Italic":   ["timesbi.ttf",       "DejaVuSerif-BoldItalic.ttf"],
-    "Georgia Regular":        ["georgia.ttf",       "DejaVuSerif.ttf"],
-    "Georgia Bold":           ["georgiab.ttf",      "DejaVuSerif-Bold.ttf"],
-    "Georgia Italic":         ["georgiai.ttf",      "DejaVuSerif-Italic.ttf"],
-    "Palatino Linotype":      ["pala.ttf",          "DejaVuSerif.ttf"],
-    "Palatino Bold":          ["palab.ttf",         "DejaVuSerif-Bold.ttf"],
-    "Book Antiqua":           ["bkant.ttf",         "DejaVuSerif.ttf"],
-    "Garamond":               ["GARA.TTF",          "DejaVuSerif.ttf"],
-    "Garamond Bold":          ["GARABD.TTF",        "DejaVuSerif-Bold.ttf"],
-    "Courier New":            ["cour.ttf",          "DejaVuSansMono.ttf"],
-    "Courier New Bold":       ["courbd.ttf",        "DejaVuSansMono-Bold.ttf"],
-    "Courier Italic":         ["couri.ttf",         "DejaVuSansMono-Oblique.ttf"],
-    "Consolas":               ["consola.ttf",       "DejaVuSansMono.ttf"],
-    "Consolas Bold":          ["consolab.ttf",      "DejaVuSansMono-Bold.ttf"],
-    "Lucida Console":         ["lucon.ttf",         "DejaVuSansMono.ttf"],
-    "Century Gothic":         ["GOTHIC.TTF",        "DejaVuSans.ttf"],
-    "Century Gothic Bold":    ["GOTHICB.TTF",       "DejaVuSans-Bold.ttf"],
-    "Century Gothic Italic":  ["GOTHICI.TTF",       "DejaVuSans-Oblique.ttf"],
-    "Impact":                 ["impact.ttf",        "DejaVuSans-Bold.ttf"],
-    "Franklin Gothic":        ["framd.ttf",         "DejaVuSans-Bold.ttf"],
-    "Candara Regular":        ["Candara.ttf",       "DejaVuSans.ttf"],
-    "Candara Bold":           ["Candarab.ttf",      "DejaVuSans-Bold.ttf"],
-    "Corbel Regular":         ["corbel.ttf",        "DejaVuSans.ttf"],
-    "Corbel Bold":            ["corbelb.ttf",       "DejaVuSans-Bold.ttf"],
-    "Rockwell":               ["ROCK.TTF",          "DejaVuSerif.ttf"],
-    "Rockwell Bold":          ["ROCKB.TTF",         "DejaVuSerif-Bold.ttf"],
-    "Brush Script MT":        ["BRUSHSCI.TTF",      "DejaVuSerif-Italic.ttf"],
-    "Lucida Handwriting":     ["lhandw.ttf",        "DejaVuSerif-Italic.ttf"],
-    "Lucida Calligraphy":     ["LCALLIG.TTF",       "DejaVuSerif-Italic.ttf"],
-    "Comic Sans MS":          ["comic.ttf",         "DejaVuSans.ttf"],
-    "Comic Sans Bold":        ["comicbd.ttf",       "DejaVuSans-Bold.ttf"],
-    "DejaVu Sans":            ["DejaVuSans.ttf",          "DejaVuSans.ttf"],
-    "DejaVu Sans Bold":       ["DejaVuSans-Bold.ttf",     "DejaVuSans-Bold.ttf"],
-    "DejaVu Serif":           ["DejaVuSerif.ttf",         "DejaVuSerif.ttf"],
-    "DejaVu Serif Bold":      ["DejaVuSerif-Bold.ttf",    "DejaVuSerif-Bold.ttf"],
-    "DejaVu Mono":            ["DejaVuSansMono.ttf",      "DejaVuSansMono.ttf"],
-    "DejaVu Mono Bold":       ["DejaVuSansMono-Bold.ttf", "DejaVuSansMono-Bold.ttf"],
-}
-
 FONT_CATS = {
     "🔤 Sans Serif":    [k for k in FONTS if any(x in k for x in ["Arial","Calibri","Tahoma","Verdana","Trebuchet","Segoe"])],
     "📜 Serif/Formal":  [k for k in FONTS if any(x in k for x in ["Times","Georgia","Palatino","Book","Garamond"])],
@@ -252,63 +219,6 @@ FONT_CATS = {
 # ─────────────────────────────────────────────────────────────────
 #  CORE HELPERS
 # ─────────────────────────────────────────────────────────────────
-def load_font(name: str, size: int) -> ImageFont.ImageFont:
-    for path in FONTS.get(name, ["DejaVuSans-Bold.ttf"]):
-        try:
-            return ImageFont.truetype(path, size)
-        except Exception:
-            continue
-    return ImageFont.load_default()
-
-def hex_to_rgba(h: str, alpha: int = 255):
-    h = h.lstrip("#")
-    return (int(h[0:2],16), int(h[2:4],16), int(h[4:6],16), alpha)
-
-def generate_cert(name: str, template: bytes, cfg: dict) -> bytes:
-    img   = Image.open(io.BytesIO(template)).convert("RGBA")
-    w, h  = img.size
-    font  = load_font(cfg["font"], cfg["size"])
-    px    = int(w * cfg["x"] / 100)
-    py    = int(h * cfg["y"] / 100)
-    layer = Image.new("RGBA", img.size, (255,255,255,0))
-    draw  = ImageDraw.Draw(layer)
-    bbox  = draw.textbbox((0,0), name, font=font)
-    tw, th = bbox[2]-bbox[0], bbox[3]-bbox[1]
-    draw.text((px-tw//2, py-th//2), name,
-              font=font, fill=hex_to_rgba(cfg["color"]))
-    out = Image.alpha_composite(img, layer).convert("RGB")
-    buf = io.BytesIO()
-    out.save(buf, format="PNG", dpi=(300,300))
-    return buf.getvalue()
-
-def cert_to_pdf(png: bytes, name: str) -> bytes:
-    buf    = io.BytesIO()
-    pw, ph = landscape(A4)
-    c      = pdf_canvas.Canvas(buf, pagesize=(pw,ph))
-    img    = Image.open(io.BytesIO(png)).convert("RGB")
-    iw, ih = img.size
-    sc     = min(pw/iw, ph/ih)
-    nw, nh = iw*sc, ih*sc
-    tmp    = io.BytesIO()
-    img.save(tmp, format="PNG"); tmp.seek(0)
-    c.drawImage(ImageReader(tmp),(pw-nw)/2,(ph-nh)/2,nw,nh,mask="auto")
-    c.setFont("Helvetica-Bold",9)
-    c.setFillColorRGB(.5,.5,.5)
-    c.drawCentredString(pw/2,14,
-        f"{name}  |  {st.session_state.event_name}  |  {datetime.now().strftime('%Y-%m-%d')}")
-    c.save()
-    return buf.getvalue()
-
-def make_qr(url: str) -> bytes:
-    qr = qrcode.QRCode(version=1,
-                       error_correction=qrcode.constants.ERROR_CORRECT_H,
-                       box_size=10, border=4)
-    qr.add_data(url)
-    qr.make(fit=True)
-    buf = io.BytesIO()
-    qr.make_image(fill_color="#0b132b", back_color="white").save(buf, format="PNG")
-    return buf.getvalue()
-
 def cur_cfg() -> dict:
     return {
         "x":    st.session_state.text_x,
@@ -316,97 +226,52 @@ def cur_cfg() -> dict:
         "size": st.session_state.font_size,
         "color":st.session_state.text_color,
         "font": st.session_state.selected_font,
+        "qr_size": st.session_state.qr_size,
+        "qr_x":    st.session_state.qr_x,
+        "qr_y":    st.session_state.qr_y,
     }
 
-def build_excel(regs: list) -> bytes:
-    wb  = openpyxl.Workbook()
-    hf  = PatternFill("solid", fgColor="1E1B4B")
-    hf2 = PatternFill("solid", fgColor="0B132B")
-    hfn = XFont(bold=True, color="FFFFFF", size=12)
-    bdr = Border(bottom=Side(style="thin", color="334466"))
-
-    ws = wb.active
-    ws.title = "Registrations"
-    ws.merge_cells("A1:H1")
-    t = ws["A1"]
-    t.value = f"  {st.session_state.event_name} — Registration Data"
-    t.font  = XFont(bold=True, color="FFD159", size=14)
-    t.fill  = hf2
-    t.alignment = Alignment(horizontal="center", vertical="center")
-    ws.row_dimensions[1].height = 34
-
-    ws.merge_cells("A2:H2")
-    info = ws["A2"]
-    try:
-        d   = datetime.strptime(st.session_state.event_date, "%Y-%m-%d")
-        day = d.strftime("%A")
-    except Exception:
-        day = ""
-    info.value = (f"Date: {st.session_state.event_date} ({day})  |  "
-                  f"Venue: {st.session_state.event_venue}  |  "
-                  f"Topic: {st.session_state.event_topic}  |  "
-                  f"Organizer: {st.session_state.organizer}  |  "
-                  f"Total: {len(regs)}")
-    info.font  = XFont(color="7ECEFD", size=10)
-    info.fill  = hf
-    info.alignment = Alignment(horizontal="center")
-    ws.row_dimensions[2].height = 18
-
-    cols_info = [("#",5),("Full Name",28),("Roll No",16),
-                 ("Department",24),("Batch",14),("Category",16),
-                 ("Date",14),("Time",10)]
-    for ci,(h,w) in enumerate(cols_info,1):
-        cell = ws.cell(row=3,column=ci,value=h)
-        cell.font = hfn; cell.fill = hf
-        cell.alignment = Alignment(horizontal="center")
-        ws.column_dimensions[get_column_letter(ci)].width = w
-    ws.row_dimensions[3].height = 22
-
-    for ri,rec in enumerate(regs,4):
-        alt = PatternFill("solid", fgColor="0F1B35" if ri%2==0 else "1A2550")
-        vals = [ri-3,rec.get("name",""),rec.get("roll_no",""),
-                rec.get("department",""),rec.get("batch",""),
-                rec.get("category",""),rec.get("date",""),rec.get("time","")]
-        for ci,val in enumerate(vals,1):
-            c = ws.cell(row=ri,column=ci,value=val)
-            c.font = XFont(color="E0E0E0",size=11)
-            c.fill = alt; c.border = bdr
-            c.alignment = Alignment(
-                horizontal="center" if ci in [1,6,7,8] else "left",
-                vertical="center")
-        ws.row_dimensions[ri].height = 20
-
-    ws2 = wb.create_sheet("Category Summary")
-    ws2.merge_cells("A1:C1")
-    t2 = ws2["A1"]; t2.value = "Category-wise Summary"
-    t2.font = XFont(bold=True,color="FFD159",size=13)
-    t2.fill = hf2; t2.alignment = Alignment(horizontal="center")
-    ws2.row_dimensions[1].height = 28
-    for ci,h in enumerate(["Category","Count","Members (Roll No)"],1):
-        c = ws2.cell(row=2,column=ci,value=h)
-        c.font = hfn; c.fill = hf
-        c.alignment = Alignment(horizontal="center")
-    cats: dict = {}
-    for rec in regs:
-        cats.setdefault(rec.get("category","Other"),[]).append(
-            f"{rec.get('name','')} [{rec.get('roll_no','')}]")
-    for ri,(cat,names) in enumerate(cats.items(),3):
-        ws2.cell(row=ri,column=1,value=cat).font = XFont(bold=True,color="FFD159")
-        ws2.cell(row=ri,column=2,value=len(names)).font = XFont(color="E0E0E0")
-        ws2.cell(row=ri,column=3,value=", ".join(names)).font = XFont(color="E0E0E0")
-        for col in range(1,4):
-            ws2.cell(row=ri,column=col).fill = hf
-    ws2.column_dimensions["A"].width = 20
-    ws2.column_dimensions["B"].width = 10
-    ws2.column_dimensions["C"].width = 80
-
-    buf = io.BytesIO()
-    wb.save(buf)
-    return buf.getvalue()
+def rec_event(rec: dict) -> str:
+    return rec.get("event") or st.session_state.event_name
+
+def cert_qr(rec: dict):
+    """Attendee ka verification QR text — Roll No na ho to None (QR nahi lagta)."""
+    if not rec.get("roll_no"):
+        return None
+    return verify_url(st.session_state.app_url, cert_id(rec_event(rec), rec["roll_no"]))
+
+def cur_template() -> Image.Image:
+    """Session ka template — decode sirf ek baar, hash se cache."""
+    return prepare_template(st.session_state.template_bytes,
+                            st.session_state.template_hash)
+
+def new_export_file(suffix: str) -> str:
+    """Is session ki purani export file delete karo, nayi temp file ka path do."""
+    old = st.session_state.zip_path
+    if old and os.path.exists(old):
+        os.remove(old)
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=EXPORT_DIR)
+    os.close(fd)
+    st.session_state.zip_path = path
+    return path
+
+def event_info() -> dict:
+    """Excel header ke liye event details (session se)."""
+    return {k: st.session_state[k] for k in
+            ("event_name", "event_date", "event_venue", "event_topic", "organizer")}
+
+def registrations_txt(regs: list) -> bytes:
+    """TXT export — har registration ek line."""
+    return "\n".join(
+        f"{r['name']} | {r['roll_no']} | {r['department']} | {r['batch']} | {r['category']}"
+        for r in regs).encode()
 
 def save_all_settings():
-    """Sidebar settings ko config file mein save karo."""
+    """Sidebar settings ko config file mein save karo (active event ki)."""
     save_config({
+        "event_id":    st.session_state.event_id,
+        "active_event": st.session_state.event_id,
         "event_name":  st.session_state.event_name,
         "event_date":  st.session_state.event_date,
         "event_venue": st.session_state.event_venue,
@@ -414,20 +279,64 @@ def save_all_settings():
         "organizer":   st.session_state.organizer,
         "categories":  st.session_state.categories,
         "app_url":     st.session_state.app_url,
+        "duplicate_policy": st.session_state.duplicate_policy,
     })
 
+def switch_event(event_id: str):
+    """Active event badlo — uski settings session mein, aur naye QR / form isi par."""
+    cfg = load_config(event_id)
+    for k in EVENT_KEYS:
+        st.session_state[k] = cfg[k]
+    st.session_state.event_id = cfg["event_id"]
+    save_config({"active_event": cfg["event_id"]})
+
 # ═════════════════════════════════════════════════════════════════
 #  ROUTING
 # ═════════════════════════════════════════════════════════════════
 qp   = st.query_params
 page = qp.get("page", "admin")
 
+# ═════════════════════════════════════════════════════════════════
+#  VERIFY PAGE  — certificate ka QR yahan laata hai (?page=verify&id=...)
+# ═════════════════════════════════════════════════════════════════
+if page == "verify":
+    st.markdown("# 🔏 Certificate Verification")
+    cid  = st.text_input("Certificate ID", value=qp.get("id", ""),
+                         placeholder="16 characters — certificate ke QR mein")
+    info = lookup_cert(cid) if cid.strip() else None
+    if info:
+        st.markdown(f"""
+        <div class="card-green">
+          <h3 style="color:#2ecc71;text-align:center;margin:0 0 14px;">
+            ✅ Yeh certificate asli hai
+          </h3>
+          <table style="width:100%;color:#c5d8f0;font-size:1.05rem;border-collapse:collapse;">
+            <tr><td style="padding:6px 0;width:40%;">👤 <b>Name</b></td>
+                <td style="color:white;font-weight:bold;">{html.escape(info['name'])}</td></tr>
+            <tr><td style="padding:6px 0;">🎓 <b>Event</b></td>
+                <td style="color:white;">{html.escape(info['event'])}</td></tr>
+            <tr><td style="padding:6px 0;">🏷️ <b>Category</b></td>
+                <td style="color:white;">{html.escape(info['category'])}</td></tr>
+          </table>
+        </div>
+        """, unsafe_allow_html=True)
+    elif cid.strip():
+        st.markdown('<div class="card-warn">❌ Is ID ka koi certificate jari nahi hua — '
+                    'yeh certificate verify nahi ho saka.</div>', unsafe_allow_html=True)
+    st.stop()
+
 # ═════════════════════════════════════════════════════════════════
 #  STUDENT FORM PAGE  — config file se data parhta hai
 # ═════════════════════════════════════════════════════════════════
 if page == "form":
+    # QR link mein event ID (?event=...) — purane links par active event
+    eid = qp.get("event") or load_config()["event_id"]
+    if not event_exists(eid):
+        st.markdown('<div class="card-warn">❌ Yeh registration link ghalat ya purana hai — '
+                    'organizer se naya QR lein.</div>', unsafe_allow_html=True)
+        st.stop()
     # Config file se settings load karo (admin ne jo set kiya)
-    cfg = load_config()
+    cfg = load_config(eid)
     event    = cfg.get("event_name", "Certificate Event")
     cats_str = cfg.get("categories", "Participant,Management")
     cats     = [c.strip() for c in cats_str.split(",") if c.strip()]
@@ -495,7 +404,10 @@ if page == "form":
             batch  = st.text_input("📅 Batch / Year ✱",
                                    placeholder="2024", key="f_batch")
 
-        category = st.selectbox("🏷️ Category — Choose accordingly ✱", cats, key="f_cat")
+        # Category wale QR se aaye ho (?cat=...) to wahi pehle se select
+        qcat     = qp.get("cat", "")
+        category = st.selectbox("🏷️ Category — Choose accordingly ✱", cats, key="f_cat",
+                                index=cats.index(qcat) if qcat in cats else 0)
 
         st.markdown("---")
         submitted = st.button("✅  Submit Now", use_container_width=True)
@@ -506,8 +418,11 @@ if page == "form":
             missing = [f for f,v in
                       [("Full Name",n),("Roll No",r),("Department",d),("Batch",b)]
                       if not v]
+            policy = cfg.get("duplicate_policy", "reject")
             if missing:
                 st.error("❌ Yeh fields zaroori hain: **" + "  |  ".join(missing) + "**")
+            elif policy == "reject" and is_registered(event, r, event_id=eid):
+                st.error(f"❌ Roll No **{r}** is event mein pehle se registered hai!")
             else:
                 now = datetime.now()
                 rec = {
@@ -518,11 +433,13 @@ if page == "form":
                     "time":  now.strftime("%H:%M:%S"),
                 }
                 # ✅ CSV mein save karo — permanent storage
-                save_registration(rec)
-                # Session mein bhi rakho for confirmation screen
-                st.session_state.form_submitted  = True
-                st.session_state.last_submission = rec
-                st.rerun()
+                if not save_registration(rec, on_duplicate=policy, event_id=eid):
+                    st.error(f"❌ Roll No **{r}** is event mein pehle se registered hai!")
+                else:
+                    # Session mein bhi rakho for confirmation screen
+                    st.session_state.form_submitted  = True
+                    st.session_state.last_submission = rec
+                    st.rerun()
 
         st.markdown('</div>', unsafe_allow_html=True)
 
@@ -561,6 +478,30 @@ if not st.session_state.admin_auth:
 
 # ── Sidebar ───────────────────────────────────────────────────────
 with st.sidebar:
+    st.markdown("## 🗂️ Event")
+    # Har event ka data alag — sab tabs sirf active event ka data chhote hain
+    events = list_events()
+    if st.session_state.event_id not in events:
+        switch_event(DEFAULT_EVENT)
+    ev_names = event_names(events)
+    picked   = st.selectbox("Active Event", events, index=events.index(st.session_state.event_id),
+                            format_func=lambda e: f"{ev_names[e]}  ({e})")
+    if picked != st.session_state.event_id:
+        switch_event(picked)
+        st.rerun()
+    with st.expander("➕ New Event"):
+        new_ev = st.text_input("Naye event ka naam", key="new_event_name")
+        if st.button("Create Event", use_container_width=True) and new_ev.strip():
+            eid = create_event(new_ev.strip())
+            save_config({"event_id": eid,
+                         "event_name": new_ev.strip(),
+                         "event_date": datetime.now().strftime("%Y-%m-%d"),
+                         "categories": st.session_state.categories,
+                         "duplicate_policy": st.session_state.duplicate_policy})
+            switch_event(eid)
+            st.rerun()
+
+    st.markdown("---")
     st.markdown("## 📋 Event Settings")
     st.session_state.event_name  = st.text_input("Event Name",         st.session_state.event_name)
     st.session_state.event_topic = st.text_input("Topic",              st.session_state.event_topic)
@@ -568,6 +509,12 @@ with st.sidebar:
     st.session_state.event_venue = st.text_input("Venue",              st.session_state.event_venue)
     st.session_state.organizer   = st.text_input("Organizer",          st.session_state.organizer)
     st.session_state.categories  = st.text_input("Categories (comma)", st.session_state.categories)
+    st.session_state.duplicate_policy = st.selectbox(
+        "Duplicate Roll No", list(DUP_POLICIES),
+        index=list(DUP_POLICIES).index(st.session_state.duplicate_policy)
+              if st.session_state.duplicate_policy in DUP_POLICIES else 0,
+        format_func=DUP_POLICIES.get,
+        help="Same event mein same Roll No dobara aaye to kya karein")
 
     st.markdown("---")
     st.markdown("## 🌐 App URL")
@@ -588,6 +535,13 @@ with st.sidebar:
     st.session_state.text_y    = st.slider("Vertical %   (↑↓)", 0,  100, st.session_state.text_y)
     st.session_state.text_color= st.color_picker("Text Color",   st.session_state.text_color)
 
+    st.markdown("---")
+    st.markdown("## 🔏 Verification QR")
+    st.session_state.qr_size = st.slider("QR Size % (0 = off)", 0, 30, st.session_state.qr_size,
+                                         help="Har certificate par signed ID wala QR")
+    st.session_state.qr_x    = st.slider("QR Horizontal %",      0, 100, st.session_state.qr_x)
+    st.session_state.qr_y    = st.slider("QR Vertical %",        0, 100, st.session_state.qr_y)
+
     st.markdown("---")
     st.markdown("## 🔤 Font Select")
     search_q = st.text_input("🔍 Font Search...", placeholder="e.g. bold, times, gothic")
@@ -626,6 +580,7 @@ with st.sidebar:
         st.rerun()
 
 # ── TABS ─────────────────────────────────────────────────────────
+event_id = st.session_state.event_id     # sab tabs isi event ke partition par
 tab1, tab2, tab3, tab4, tab5 = st.tabs([
     "🔳 QR Generate",
     "📊 Registered Data",
@@ -657,24 +612,37 @@ with tab1:
 
             ev   = st.session_state.event_name.replace(" ","%20")
             cats = st.session_state.categories.replace(" ","%20")
-            qr_url = f"{saved_url.rstrip('/')}/?page=form"
-
-            if st.button("🔳 QR Generate / Refresh Karein", use_container_width=True):
-                st.session_state.qr_data = make_qr(qr_url)
-                st.success("✅ QR ready!")
-
-            # Auto-generate on load if not already
-            if not st.session_state.qr_data:
-                st.session_state.qr_data = make_qr(qr_url)
-
-            if st.session_state.qr_data:
-                st.image(st.session_state.qr_data, width=250,
-                         caption="Yeh QR print karo → event mein lagao")
-                st.download_button("⬇️ QR PNG Download",
-                    data=st.session_state.qr_data,
-                    file_name="registration_qr.png", mime="image/png",
+            qr_url = f"{saved_url.rstrip('/')}/?page=form&event={event_id}"
+
+            q1, q2 = st.columns(2)
+            with q1: qr_fmt   = st.selectbox("Format", list(QR_FORMATS),
+                                             format_func=str.upper,
+                                             help="SVG / PDF vector hain — poster print ke liye")
+            with q2: qr_level = st.selectbox("Error correction", list(ERROR_LEVELS), index=3)
+
+            # QR engine (url, format, level) par cache karta hai — rerun par dobara nahi banta
+            qr_file = make_qr(qr_url, qr_fmt, qr_level)
+            st.image(make_qr(qr_url, "png", qr_level), width=250,
+                     caption="Yeh QR print karo → event mein lagao")
+            st.download_button(f"⬇️ QR {qr_fmt.upper()} Download",
+                data=qr_file,
+                file_name=f"registration_qr.{qr_fmt}", mime=QR_FORMATS[qr_fmt],
+                use_container_width=True)
+            st.code(qr_url, language=None)
+
+            # Har category ka alag QR — form par woh category pehle se select hoti hai
+            cat_list = [c.strip() for c in st.session_state.categories.split(",") if c.strip()]
+            if cat_list:
+                cat_qrs = make_qr_batch({c: f"{qr_url}&cat={quote(c)}" for c in cat_list},
+                                        qr_fmt, level=qr_level)
+                buf = io.BytesIO()
+                with zipfile.ZipFile(buf, "w") as zf:
+                    for c, data in cat_qrs.items():
+                        zip_add(zf, f"QR_{c.replace(' ','_')}.{qr_fmt}", data)
+                st.download_button(f"⬇️ Har category ka QR ({len(cat_qrs)}) — ZIP",
+                    data=buf.getvalue(),
+                    file_name="category_qr_codes.zip", mime="application/zip",
                     use_container_width=True)
-                st.code(qr_url, language=None)
         else:
             st.markdown("""
             <div class="card-warn">
@@ -732,9 +700,12 @@ Student QR scan karne ke baad **yeh form dekhega:**
                         "date":now.strftime("%Y-%m-%d"),
                         "time":now.strftime("%H:%M:%S"),
                     }
-                    save_registration(rec)
-                    st.success(f"✅ {mn.strip()} add ho gaya!")
-                    st.rerun()
+                    if save_registration(rec, on_duplicate=st.session_state.duplicate_policy,
+                                         event_id=event_id):
+                        st.success(f"✅ {mn.strip()} add ho gaya!")
+                        st.rerun()
+                    else:
+                        st.error(f"❌ Roll No {mr.strip()} pehle se registered hai!")
                 else:
                     st.error("Naam aur Roll No zaroori hain!")
         st.markdown('</div>', unsafe_allow_html=True)
@@ -743,53 +714,72 @@ Student QR scan karne ke baad **yeh form dekhega:**
 #  TAB 2 — Registered Data
 # ═══════════════════════════════════════
 with tab2:
-    # Har baar CSV se fresh data load karo
-    regs = load_registrations()
     st.markdown("### 📊 Registered Data")
 
     # Auto-refresh button
     if st.button("🔄 Refresh Data"):
         st.rerun()
 
+    # Counts store ke index se — har category ke liye rows scan nahi
+    counts   = category_counts(event_id)
+    total    = sum(counts.values())
     cat_list = [c.strip() for c in st.session_state.categories.split(",") if c.strip()]
     m_cols   = st.columns(len(cat_list) + 1)
-    m_cols[0].metric("Total", len(regs))
+    m_cols[0].metric("Total", total)
     for i, cat in enumerate(cat_list):
-        m_cols[i+1].metric(cat, sum(1 for r in regs if r.get("category","") == cat))
+        m_cols[i+1].metric(cat, counts.get(cat, 0))
 
     st.markdown("---")
 
-    if regs:
-        df = pd.DataFrame(regs)
-        rename = {"name":"Full Name","roll_no":"Roll No","department":"Department",
-                  "batch":"Batch","category":"Category","event":"Event",
-                  "date":"Date","time":"Time"}
-        df = df.rename(columns={k:v for k,v in rename.items() if k in df.columns})
-
-        filter_cat = st.selectbox("Category filter:",
-                                  ["All"] + cat_list, key="flt_cat")
-        df_show = df[df["Category"] == filter_cat] if filter_cat != "All" else df
-        st.dataframe(df_show, use_container_width=True, height=380)
-
+    if total:
+        # Filter / search / page store mein — browser ko sirf ek page jata hai
+        f1, f2, f3 = st.columns([2, 3, 1])
+        with f1:
+            filter_cat = st.selectbox("Category filter:",
+                                      ["All"] + cat_list, key="flt_cat")
+        with f2:
+            search = st.text_input("🔍 Search (naam / roll no / department):", key="flt_q")
+        with f3:
+            per_page = st.selectbox("Har page par", [25, 50, 100, 200], index=1, key="reg_per_page")
+        cat = None if filter_cat == "All" else filter_cat
+        _, found = query_registrations(cat, search, 1, per_page, event_id)
+        pages = max(-(-found // per_page), 1)
+        page  = st.number_input(f"Page (1–{pages})", 1, pages, 1, key="reg_page") if pages > 1 else 1
+        shown, found = query_registrations(cat, search, int(page), per_page, event_id)
+
+        if shown:
+            start = (int(page) - 1) * per_page
+            df = pd.DataFrame(shown, columns=CSV_HEADERS).fillna("")
+            df.index = range(start + 1, start + len(shown) + 1)
+            rename = {"name":"Full Name","roll_no":"Roll No","department":"Department",
+                      "batch":"Batch","category":"Category","event":"Event",
+                      "date":"Date","time":"Time"}
+            st.dataframe(df.rename(columns=rename), use_container_width=True, height=380)
+            st.caption(f"{start+1}–{start+len(shown)} / {found}"
+                       + (f"  (kul {total})" if found != total else ""))
+        else:
+            st.info("🔍 Is filter / search se koi registration nahi mili.")
         st.markdown("---")
         c1, c2, c3 = st.columns(3)
+        # Exports sirf download click par bante hain — store version + event
+        # same ho to pichla result (callable alag thread mein, session pehle le lo)
+        ev = event_info()
         with c1:
-            excel = build_excel(regs)
             st.download_button("📊 Excel Download",
-                data=excel,
+                data=lambda: cached_export("excel", lambda rows: build_excel(rows, ev),
+                                           tuple(ev.items()), event_id),
+                on_click="ignore",
                 file_name=f"{st.session_state.event_name.replace(' ','_')}_Data.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 use_container_width=True)
         with c2:
-            txt = "\n".join(
-                f"{r['name']} | {r['roll_no']} | {r['department']} | {r['batch']} | {r['category']}"
-                for r in regs)
             st.download_button("📄 TXT Download",
-                data=txt.encode(), file_name="registrations.txt",
+                data=lambda: cached_export("txt", registrations_txt, event_id=event_id),
+                on_click="ignore", file_name="registrations.txt",
                 mime="text/plain", use_container_width=True)
         with c3:
             if st.button("🗑️ Sab Clear Karo", use_container_width=True):
-                clear_registrations()
+                clear_registrations(event_id)
                 st.success("✅ Data clear ho gaya!")
                 st.rerun()
     else:
@@ -813,7 +803,11 @@ with tab3:
         tpl = st.file_uploader("Template (.png/.jpg/.jpeg)",
                                type=["png","jpg","jpeg"])
         if tpl:
-            st.session_state.template_bytes = tpl.read()
+            # Har rerun par poori file dobara read + hash na ho — sirf nayi upload par
+            if st.session_state.template_file != tpl.file_id:
+                st.session_state.template_bytes = tpl.getvalue()
+                st.session_state.template_hash  = template_hash(st.session_state.template_bytes)
+                st.session_state.template_file  = tpl.file_id
             img_tmp = Image.open(io.BytesIO(st.session_state.template_bytes))
             st.success(f"✅ {tpl.name}  —  {img_tmp.width}×{img_tmp.height}px")
         if st.session_state.template_bytes:
@@ -833,47 +827,63 @@ with tab3:
                 f"**Pos:** ({st.session_state.text_x}%, {st.session_state.text_y}%) | "
                 f"**Color:** `{st.session_state.text_color}`")
             pname    = st.text_input("Preview naam:", value="Muhammad Ali Khan")
-            png_prev = generate_cert(pname, st.session_state.template_bytes, cur_cfg())
-            st.image(png_prev, use_container_width=True)
+            tpl_img, cfg, event = cur_template(), cur_cfg(), st.session_state.event_name
+            pqr      = cert_qr({"roll_no": "PREVIEW"})     # sirf QR ki jagah dikhane ke liye
+            # Screen par proxy (chhota) render — full-size sirf download par
+            st.image(preview_thumb(pname, tpl_img, cfg, PREVIEW_WIDTH, pqr),
+                     use_container_width=True)
             pa, pb = st.columns(2)
             with pa:
-                st.download_button("⬇️ PNG", png_prev,
-                    file_name=f"Preview_{pname}.png", mime="image/png",
+                st.download_button("⬇️ PNG", lambda: preview_png(pname, tpl_img, cfg, pqr),
+                    file_name=f"Preview_{pname}.png", mime="image/png", on_click="ignore",
                     use_container_width=True)
             with pb:
-                st.download_button("⬇️ PDF", cert_to_pdf(png_prev, pname),
-                    file_name=f"Preview_{pname}.pdf", mime="application/pdf",
+                # PDF sirf button dabane par banta hai (callable = deferred download)
+                st.download_button("⬇️ PDF", lambda: preview_pdf(pname, tpl_img, cfg, event, pqr),
+                    file_name=f"Preview_{pname}.pdf", mime="application/pdf", on_click="ignore",
                     use_container_width=True)
         else:
             st.warning("⚠️ Pehle template upload karo")
         st.markdown('</div>', unsafe_allow_html=True)
 
     # Preview all
-    regs = load_registrations()
+    regs = load_registrations(event_id)
     if st.session_state.template_bytes and regs:
         st.markdown("---")
         st.markdown("### 👁️ Sabke Certificates Preview")
-        names_all = [r["name"] for r in regs]
-        show_n = st.slider("Kitne preview?",
-                           1, min(len(names_all), 30), min(6, len(names_all)))
+        # Sirf current page ke thumbnails render hote hain
+        pg1, pg2 = st.columns(2)
+        with pg1:
+            per_page = st.selectbox("Har page par", [6, 12, 24, 48], index=0)
+        pages = -(-len(regs) // per_page)
+        with pg2:
+            page = st.number_input(f"Page (1–{pages})", 1, pages, 1)
+        start   = (int(page) - 1) * per_page
+        shown   = regs[start:start+per_page]
         per_row = 3
-        for i in range(0, show_n, per_row):
-            row_n = names_all[i:i+per_row]
+        tpl_img, cfg = cur_template(), cur_cfg()
+        st.caption(f"{start+1}–{start+len(shown)} / {len(regs)}")
+        for i in range(0, len(shown), per_row):
+            row_n = shown[i:i+per_row]
             cs    = st.columns(per_row)
-            for ci, nm in enumerate(row_n):
+            for ci, rec in enumerate(row_n):
+                nm, qr = rec["name"], cert_qr(rec)
                 with cs[ci]:
-                    pv = generate_cert(nm, st.session_state.template_bytes, cur_cfg())
-                    st.image(pv, caption=nm, use_container_width=True)
+                    st.image(preview_thumb(nm, tpl_img, cfg, qr=qr), caption=nm,
+                             use_container_width=True)
+                    # Full-resolution PNG sirf download dabane par banta hai —
+                    # page payload mein bytes nahi jate, aur download par rerun bhi nahi
                     st.download_button(f"⬇️ {nm[:16]}",
-                        data=pv, file_name=f"{nm}.png",
-                        mime="image/png", key=f"pv_{nm}_{i}_{ci}")
+                        data=lambda nm=nm, qr=qr: generate_cert(nm, tpl_img, cfg, qr),
+                        file_name=f"{nm}.png", mime="image/png",
+                        on_click="ignore", key=f"pv_{start+i+ci}_{nm}")
 
 # ═══════════════════════════════════════
 #  TAB 4 — Generate Certificates
 # ═══════════════════════════════════════
 with tab4:
     st.markdown("### 🚀 Certificates Generate Karein")
-    regs = load_registrations()
+    regs = load_registrations(event_id)
 
     if not st.session_state.template_bytes:
         st.markdown('<div class="card-warn">⚠️ Pehle Tab 3 mein template upload karo!</div>',
@@ -891,35 +901,77 @@ with tab4:
         c4.metric("Pos",   f"{st.session_state.text_x}%,{st.session_state.text_y}%")
 
         st.markdown("---")
-        fc1, fc2 = st.columns(2)
+        fc1, fc2, fc3, fc4 = st.columns(4)
         with fc1: do_png = st.checkbox("✅ PNG", value=True)
         with fc2: do_pdf = st.checkbox("✅ PDF", value=True)
+        with fc3: do_merged = st.checkbox("📚 Ek merged PDF", value=False,
+                                          help="Ek hi PDF, har attendee ka ek page — "
+                                               "template sirf ek baar embed hota hai")
+        with fc4: workers = st.number_input("⚙️ Workers (CPU cores)", 1, 64,
+                                            min(DEFAULT_WORKERS, 64))
+        zip_mode = st.radio("🗜️ ZIP compression", list(ZIP_MODES),
+                            format_func=ZIP_MODES.get, horizontal=True)
+        pdf_mode = st.radio("📄 PDF mode", list(PDF_MODES),
+                            format_func=PDF_MODES.get, horizontal=True,
+                            help="Vector: naam text ki tarah — chhoti file, print mein sharp")
+        cc1, cc2 = st.columns([3,1])
+        with cc1:
+            use_cache = st.checkbox("♻️ Pehle bane certificates dobara use karo", value=True,
+                                    help="Sirf naye ya badle hue certificates render honge")
+            n_files, mb = render_cache_usage()
+            st.caption(f"Cache: {n_files} files, {mb:.1f} MB")
+        with cc2:
+            if st.button("🗑️ Cache clear"):
+                clear_render_cache()
+                st.rerun()
 
         if st.button(f"🚀 Generate All {len(regs)} Certificates",
                      use_container_width=True):
-            cfg_now = cur_cfg()
-            prog    = st.progress(0)
-            status  = st.empty()
-            buf_zip = io.BytesIO()
-
-            with zipfile.ZipFile(buf_zip, "w", zipfile.ZIP_DEFLATED) as zf:
-                for i, rec in enumerate(regs):
-                    nm  = rec["name"]
-                    cat = rec.get("category","Other")
-                    status.markdown(f"⏳ **{nm}** [{cat}]  ({i+1}/{len(regs)})")
-                    png = generate_cert(nm, st.session_state.template_bytes, cfg_now)
-                    if do_png: zf.writestr(f"PNG/{cat}/{nm}.png", png)
-                    if do_pdf: zf.writestr(f"PDF/{cat}/{nm}.pdf", cert_to_pdf(png, nm))
-                    prog.progress((i+1)/len(regs))
-
-            status.success(f"✅ {len(regs)} certificates ready!")
+            prog     = st.progress(0)
+            status   = st.empty()
+            zip_path = new_export_file(".zip")
+            names   = [r["name"] for r in regs]
+            qrs     = [cert_qr(r) for r in regs]
+
+            # ZIP seedha disk par likho — RAM mein poora archive kabhi nahi rehta
+            with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+                hits0 = cache_stats["hits"]
+                if do_png or do_pdf:
+                    results = generate_batch(names, st.session_state.template_bytes,
+                                             cur_cfg(), st.session_state.event_name,
+                                             do_png, do_pdf, int(workers),
+                                             key=st.session_state.template_hash,
+                                             pdf_mode=pdf_mode, cache=use_cache, qrs=qrs)
+                    for i, (rec, (png, pdf)) in enumerate(zip(regs, results)):
+                        nm  = rec["name"]
+                        cat = rec.get("category","Other")
+                        if png: zip_add(zf, f"PNG/{cat}/{nm}.png", png, zip_mode)
+                        if pdf: zip_add(zf, f"PDF/{cat}/{nm}.pdf", pdf, zip_mode)
+                        status.markdown(f"⏳ **{nm}** [{cat}]  ({i+1}/{len(regs)})")
+                        prog.progress((i+1)/len(regs))
+                if do_merged:
+                    status.markdown(f"⏳ 📚 Merged PDF — {len(names)} pages")
+                    zip_add(zf, "All_Certificates.pdf",
+                            names_to_pdf(names, cur_template(), cur_cfg(),
+                                         st.session_state.event_name, qrs), zip_mode)
+                    prog.progress(1.0)
+
+            # Verify page (?page=verify) ke liye index — Roll No wale sab certificates
+            issued = issue_certs((cert_id(rec_event(r), r["roll_no"]), r["name"],
+                                  rec_event(r), r.get("category", "Other"))
+                                 for r in regs if r.get("roll_no"))
+            reused = cache_stats["hits"] - hits0
+            status.success(f"✅ {len(regs)} certificates ready!"
+                           + (f"  (♻️ {reused} files cache se)" if reused else "")
+                           + f"  🔏 {issued} verify index mein")
             st.balloons()
             zname = f"{st.session_state.event_name.replace(' ','_')}_Certificates.zip"
-            st.download_button(
-                f"⬇️ Download All ({len(regs)}) — ZIP",
-                data=buf_zip.getvalue(),
-                file_name=zname, mime="application/zip",
-                use_container_width=True)
+            with open(zip_path, "rb") as fz:
+                st.download_button(
+                    f"⬇️ Download All ({len(regs)}) — ZIP",
+                    data=fz,
+                    file_name=zname, mime="application/zip",
+                    use_container_width=True)
 
 # ═══════════════════════════════════════
 #  TAB 5 — GitHub Guide
@@ -930,16 +982,22 @@ with tab5:
 
 ## ☁️ GitHub + Streamlit Cloud — Free Hosting
 
-### Sirf 2 files upload karo GitHub par:
+### Sirf yeh files upload karo GitHub par:
 ```
 app.py
+cert_engine.py
+cert_index.py
+cli.py
+excel_export.py
+qr_engine.py
+reg_store.py
 requirements.txt
 ```
 
 ### PowerShell commands:
 ```bash
 cd d:/Avalon.AI
-git add app.py requirements.txt
+git add app.py cert_engine.py cert_index.py cli.py excel_export.py qr_engine.py reg_store.py requirements.txt
 git commit -m "QR Certificate Generator Pro V3.0"
 git push
 ```
@@ -952,9 +1010,27 @@ git push
 
 **Ab dobara URL likhne ki zaroorat nahi — config.json mein save ho jata hai!**
 
+### 🔏 Verification QR ka secret:
+Har certificate ke QR mein signed ID hoti hai. Streamlit Cloud par app ke
+**Settings → Secrets** mein `CERT_SECRET = "koi lamba random text"` daal do —
+warna restart par nayi key banegi aur purane certificates verify nahi honge.
+`cert_secret.key` file GitHub par kabhi upload mat karo!
+
+### 🗂️ Kai events:
+Sidebar → **Event → ➕ New Event** se naya event banao. Har event ka data
+`events/<event_id>/` mein alag rehta hai, aur uske QR link mein `&event=<event_id>`
+hota hai — purane event ka data clear karne ki zaroorat nahi.
+
+### 🖥️ Bina browser ke (hazaaron certificates / nightly job):
+```bash
+python cli.py template.png --cfg cfg.json --event <event_id> --out certs.zip
+```
+`cfg.json` mein wahi text / QR settings (x, y, size, color, font, qr_size, qr_x, qr_y).
+Beech mein ruk jaye to wahi command dobara chalao — checkpoint se aage chalta hai.
+
 ### Update karne ka tarika:
 ```bash
-git add app.py
+git add app.py cert_engine.py cert_index.py cli.py excel_export.py qr_engine.py reg_store.py
 git commit -m "update"
 git push
 ```
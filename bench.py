@@ -0,0 +1,327 @@
+"""
+Benchmarks — cert_engine ki speed / memory naapne ke liye.
+
+RUN:  python bench.py            (sab benchmarks)
+      python bench.py overlay    (sirf ek)
+"""
+
+from PIL import Image, ImageDraw
+import io, os, sys, time, tempfile, zipfile, threading, statistics, resource
+import multiprocessing as mp
+import cert_engine as ce
+import reg_store as rs
+
+CFG = {"x": 50, "y": 60, "size": 120, "color": "#1a1a1a", "font": "Arial Bold"}
+
+def make_template(w: int = 3840, h: int = 2160, photo: bool = False) -> bytes:
+    """Benchmark ke liye gradient template (4K default).
+
+    ``photo=True`` par noise mila diya jata hai — photo/texture wale asli
+    templates ki tarah jo lossless compress nahi hote.
+    """
+    img = Image.linear_gradient("L").resize((w, h))
+    if photo:
+        img = Image.blend(img, Image.effect_noise((w, h), 64), 0.3)
+    img = img.convert("RGB")
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+def _isolated(fn, *args):
+    """fn ko fresh process mein chalao — fn (setup, run) return karta hai.
+
+    Wapas aata hai (run ka result, run ke dauran peak RSS kitna barha MB mein).
+    """
+    # Bade buffers hamesha mmap se — free hote hi RSS se nikal jate hain,
+    # warna setup ka peak run ke peak ko chhupa deta hai.
+    os.environ["MALLOC_MMAP_THRESHOLD_"] = str(1 << 20)
+    ctx = mp.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        return pool.apply(_peak_rss, (fn, args))
+
+def _maxrss_mb() -> float:
+    """Is process ka peak RSS (VmHWM) — ru_maxrss fork ke baad parent ka peak le aata hai."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _peak_rss(fn, args):
+    run  = fn(*args)
+    base = _maxrss_mb()
+    res  = run()
+    return res, _maxrss_mb() - base
+
+# ─────────────────────────────────────────────────────────────────
+#  OVERLAY  — full-size layer vs bbox tile
+# ─────────────────────────────────────────────────────────────────
+def _full_overlay_cert(name: str, img: Image.Image, cfg: dict) -> bytes:
+    """Purana tareeqa: template jitna RGBA layer + poora alpha_composite."""
+    w, h  = img.size
+    font  = ce.load_font(cfg["font"], cfg["size"])
+    px    = int(w * cfg["x"] / 100)
+    py    = int(h * cfg["y"] / 100)
+    layer = Image.new("RGBA", img.size, (255,255,255,0))
+    draw  = ImageDraw.Draw(layer)
+    bbox  = draw.textbbox((0,0), name, font=font)
+    tw, th = bbox[2]-bbox[0], bbox[3]-bbox[1]
+    draw.text((px-tw//2, py-th//2), name,
+              font=font, fill=ce.hex_to_rgba(cfg["color"]))
+    out = Image.alpha_composite(img, layer).convert("RGB")
+    buf = io.BytesIO()
+    out.save(buf, format="PNG", dpi=(300,300))
+    return buf.getvalue()
+
+def _run_overlay(kind: str, n: int, template: bytes):
+    img  = ce.prepare_template(template)
+    gen  = _full_overlay_cert if kind == "full" else ce.generate_cert
+    def run():
+        t0 = time.perf_counter()
+        for i in range(n):
+            gen(f"Attendee Number {i}", img, CFG)
+        return (time.perf_counter() - t0) / n
+    return run
+
+def bench_overlay(n: int = 10):
+    tpl = make_template()
+    img = ce.prepare_template(tpl)
+    same = all(_full_overlay_cert(nm, img, CFG) == ce.generate_cert(nm, img, CFG)
+               for nm in ["Muhammad Ali Khan", "W", "Ayesha Siddiqa"])
+    print(f"overlay  4K template, {n} certs  (pixel-identical: {same})")
+    for kind in ("full", "tile"):
+        per, rss = _isolated(_run_overlay, kind, n, tpl)
+        print(f"  {kind:5s} {per*1000:8.1f} ms/cert   peak RSS +{rss:6.1f} MB")
+
+# ─────────────────────────────────────────────────────────────────
+#  PREVIEW  — grid thumbnails: full-size render vs proxy render
+# ─────────────────────────────────────────────────────────────────
+def _run_preview(kind: str, n: int, template: bytes):
+    img = ce.prepare_template(template)
+    if kind == "full":
+        gen = lambda nm: ce.generate_cert(nm, img, CFG)
+    else:
+        gen = lambda nm: ce.encode_jpeg(ce.render_proxy(nm, img, CFG, ce.THUMB_WIDTH))
+    def run():
+        t0   = time.perf_counter()
+        size = sum(len(gen(f"Attendee Number {i}")) for i in range(n))
+        return time.perf_counter() - t0, size
+    return run
+
+def bench_preview(n: int = 30):
+    tpl = make_template()
+    print(f"preview  4K template, {n} grid thumbnails")
+    for kind in ("full", "proxy"):
+        (dt, size), rss = _isolated(_run_preview, kind, n, tpl)
+        print(f"  {kind:5s} {dt:7.2f} s   {size/1e6:7.2f} MB sent   peak RSS +{rss:6.1f} MB")
+
+# ─────────────────────────────────────────────────────────────────
+#  ZIP  — fast (PNG/PDF stored) vs small (sab deflate)
+# ─────────────────────────────────────────────────────────────────
+def bench_zip(n: int = 500, unique: int = 25):
+    """n certificates (PNG + PDF) ka ZIP dono modes mein.
+
+    Render mehnga hai is liye ``unique`` certificates bana kar dohraye jate
+    hain — deflate har entry alag compress karta hai, to timing/size same rehti hai.
+    """
+    tpl   = make_template(1754, 1240)
+    certs = list(ce.generate_batch([f"Attendee Number {i}" for i in range(unique)],
+                                   tpl, CFG, "Benchmark Event", workers=1))
+    raw   = sum(len(png) + len(pdf) for png, pdf in certs) * n // unique
+    print(f"zip      {n} certs PNG+PDF  ({raw/1e6:.1f} MB raw)")
+    for mode in ce.ZIP_MODES:
+        with tempfile.TemporaryFile() as f:
+            t0 = time.perf_counter()
+            with zipfile.ZipFile(f, "w") as zf:
+                for i in range(n):
+                    png, pdf = certs[i % unique]
+                    ce.zip_add(zf, f"PNG/Participant/{i}.png", png, mode)
+                    ce.zip_add(zf, f"PDF/Participant/{i}.pdf", pdf, mode)
+            dt   = time.perf_counter() - t0
+            size = f.tell()
+        print(f"  {mode:5s} {dt:7.2f} s   {size/1e6:8.1f} MB")
+
+# ─────────────────────────────────────────────────────────────────
+#  PDF  — n raster PDFs vs n vector-text PDFs vs ek merged PDF
+# ─────────────────────────────────────────────────────────────────
+def bench_pdf(n: int = 50):
+    names = [f"Attendee Number {i}" for i in range(n)]
+    for photo in (False, True):
+        img = ce.prepare_template(make_template(3508, 2480, photo))
+        print(f"pdf      {n} names, A4 300-dpi {'photo' if photo else 'flat'} template")
+        for kind in ("raster", "vector"):
+            t0   = time.perf_counter()
+            if kind == "raster":
+                size = sum(len(ce.cert_to_pdf(ce.render_cert(nm, img, CFG), nm, "Benchmark Event"))
+                           for nm in names)
+            else:
+                size = sum(len(ce.cert_to_vector_pdf(nm, img, CFG, "Benchmark Event"))
+                           for nm in names)
+            print(f"  {kind:6s} {time.perf_counter()-t0:7.2f} s   {size/1e6:8.2f} MB  ({n} files)")
+        t0   = time.perf_counter()
+        size = len(ce.names_to_pdf(names, img, CFG, "Benchmark Event"))
+        print(f"  merged {time.perf_counter()-t0:7.2f} s   {size/1e6:8.2f} MB  (1 file)")
+
+# ─────────────────────────────────────────────────────────────────
+#  SUBMITS  — bohot saare students ek saath (load test)
+# ─────────────────────────────────────────────────────────────────
+def _submit_many(args):
+    folder, backend, worker, n = args
+    os.chdir(folder)
+    rs.BACKEND = backend
+    for i in range(n):
+        rs.save_registration({
+            "name": f"Student {worker}-{i}", "roll_no": f"{worker}-{i}",
+            "department": "Computer Science " * 8, "batch": "2024",
+            "category": "Participant", "event": "Load Test",
+            "date": "2024-01-01", "time": "10:00:00"})
+    return n
+
+def bench_submits(procs: int = 8, per: int = 250):
+    """procs processes ek saath per-per registrations submit karte hain —
+    phir check: koi row gum ya kharab to nahi."""
+    print(f"submits  {procs} processes x {per} concurrent registrations")
+    ctx = mp.get_context("spawn")
+    for backend in ("csv", "sqlite"):
+        with tempfile.TemporaryDirectory() as folder:
+            t0 = time.perf_counter()
+            with ctx.Pool(procs) as pool:
+                pool.map(_submit_many, [(folder, backend, w, per) for w in range(procs)])
+            dt = time.perf_counter() - t0
+            cwd = os.getcwd()
+            os.chdir(folder)
+            rs.BACKEND = backend
+            rows = rs.load_registrations()
+            os.chdir(cwd)
+            want = {f"{w}-{i}" for w in range(procs) for i in range(per)}
+            good = {r["roll_no"] for r in rows
+                    if r["name"] == f"Student {r['roll_no']}" and r["time"] == "10:00:00"}
+            print(f"  {backend:6s} {dt:6.2f} s   rows {len(rows):5d}/{len(want)}   "
+                  f"lost {len(want - good):4d}   corrupt {len(rows) - len(good):4d}")
+
+def bench_burst(users: int = 200, per: int = 5):
+    """Ek process mein users sessions (threads) ek saath submit karein —
+    har row alag flush vs writer queue ke batch. batches ~ fsync/commit count."""
+    print(f"burst    {users} sessions x {per} submits")
+    for backend in ("csv", "sqlite"):
+        for label, rows, wait in (("1/flush", 1, 0.0), ("batched", 64, 0.01)):
+            with tempfile.TemporaryDirectory() as folder:
+                cwd = os.getcwd()
+                os.chdir(folder)
+                rs.BACKEND, rs.FLUSH_MAX_ROWS, rs.FLUSH_MAX_WAIT = backend, rows, wait
+                rs.write_stats.update(batches=0, rows=0)
+                lat   = []
+                start = threading.Barrier(users)
+                def user(u):
+                    start.wait()
+                    for i in range(per):
+                        t0 = time.perf_counter()
+                        rs.save_registration({"name": f"S {u}-{i}", "roll_no": f"{u}-{i}"})
+                        lat.append(time.perf_counter() - t0)
+                t0 = time.perf_counter()
+                ts = [threading.Thread(target=user, args=(u,)) for u in range(users)]
+                for t in ts: t.start()
+                for t in ts: t.join()
+                dt = time.perf_counter() - t0
+                rs.shutdown()
+                os.chdir(cwd)
+            lat.sort()
+            print(f"  {backend:6s} {label:8s} {dt:6.2f} s   batches {rs.write_stats['batches']:5d}   "
+                  f"p50 {statistics.median(lat)*1000:7.1f} ms   p95 {lat[int(len(lat)*.95)]*1000:7.1f} ms")
+
+# ─────────────────────────────────────────────────────────────────
+#  CACHE  — poora run vs dobara run jab sirf kuch naye naam aaye
+# ─────────────────────────────────────────────────────────────────
+def bench_cache(n: int = 200, new: int = 20):
+    tpl   = make_template(1754, 1240)
+    names = [f"Attendee Number {i}" for i in range(n)]
+    with tempfile.TemporaryDirectory() as folder:
+        ce.RENDER_CACHE_DIR = folder
+        print(f"cache    {n} certs PNG+PDF, phir {new} naye registrations")
+        for label, batch, cache in (("no cache", names, False),
+                                    ("cold",     names, True),
+                                    (f"+{new} new", names + [f"Late {i}" for i in range(new)], True)):
+            t0 = time.perf_counter()
+            for _ in ce.generate_batch(batch, tpl, CFG, "Benchmark Event", workers=1, cache=cache):
+                pass
+            print(f"  {label:9s} {time.perf_counter()-t0:7.2f} s")
+
+# ─────────────────────────────────────────────────────────────────
+#  VERIFY QR  — har certificate par QR lagane ki keemat
+# ─────────────────────────────────────────────────────────────────
+def bench_qr(n: int = 40):
+    import qr_engine as qe
+    tpl   = make_template(3508, 2480)
+    names = [f"Attendee Number {i}" for i in range(n)]
+    qrs   = [qe.verify_url("https://example.streamlit.app", qe.cert_id("Benchmark Event", f"24-BSCS-{i}"))
+             for i in range(n)]
+    cfg   = dict(CFG, qr_x=88, qr_y=80, qr_size=10)
+    print(f"qr       {n} certs PNG+PDF, A4 300-dpi, workers=1")
+    base = None
+    for label, codes in (("no QR", None), ("with QR", qrs)):
+        t0 = time.perf_counter()
+        for _ in ce.generate_batch(names, tpl, cfg, "Benchmark Event", workers=1, qrs=codes):
+            pass
+        dt   = time.perf_counter() - t0
+        base = base or dt
+        print(f"  {label:8s} {dt:7.2f} s   {n/dt:6.2f} certs/s   {(dt/base-1)*100:+5.1f}%")
+    t0 = time.perf_counter()
+    for q in qrs:
+        ce.qr_modules(q)
+    print(f"  qr_modules {(time.perf_counter()-t0)/n*1000:6.2f} ms/QR (encode only)")
+
+# ─────────────────────────────────────────────────────────────────
+#  VERIFY  — issued certificates index (build + lookups)
+# ─────────────────────────────────────────────────────────────────
+def bench_verify(n: int = 300_000, lookups: int = 20_000):
+    import random, cert_index as ci, qr_engine as qe
+    certs = [(qe.cert_id(f"Event {i % 30}", f"R-{i}"), f"Student {i}", f"Event {i % 30}", "Participant")
+             for i in range(n)]
+    with tempfile.TemporaryDirectory() as folder:
+        cwd = os.getcwd()
+        os.chdir(folder)
+        t0 = time.perf_counter()
+        ci.issue_certs(certs)
+        build = time.perf_counter() - t0
+        size  = os.path.getsize(ci.INDEX_FILE)
+        print(f"verify   {n} issued certificates — build {build:.2f} s, {size/1e6:.1f} MB")
+        for label, ids in (("hit",  [c[0] for c in random.sample(certs, lookups)]),
+                           ("miss", [qe.cert_id("Fake", str(i)) for i in range(lookups)])):
+            t0 = time.perf_counter()
+            for cid in ids:
+                ci.lookup_cert(cid)
+            print(f"  {label:5s} {(time.perf_counter()-t0)/lookups*1e6:7.1f} us/lookup")
+        os.chdir(cwd)
+
+# ─────────────────────────────────────────────────────────────────
+#  EXCEL  — Tab 2 ka styled export, bade registration sets
+# ─────────────────────────────────────────────────────────────────
+def bench_excel(n: int = 50_000):
+    import excel_export as xe
+    regs = [{"name": f"Student {i}", "roll_no": f"24-BSCS-{i}", "department": "Computer Science",
+             "batch": "2024", "category": ("Participant", "Management")[i % 2],
+             "event": "Benchmark Event", "date": "2024-01-01", "time": "10:00:00"}
+            for i in range(n)]
+    event = {"event_name": "Benchmark Event", "event_date": "2024-01-01",
+             "event_venue": "Hall", "event_topic": "Perf", "organizer": "Bench"}
+    t0   = time.perf_counter()
+    size = len(xe.build_excel(regs, event))
+    dt   = time.perf_counter() - t0
+    print(f"excel    {n} rows — {dt:6.2f} s   {n/dt:8.0f} rows/s   {size/1e6:5.2f} MB")
+
+BENCHES = {
+    "overlay": bench_overlay,
+    "preview": bench_preview,
+    "zip":     bench_zip,
+    "pdf":     bench_pdf,
+    "submits": bench_submits,
+    "burst":   bench_burst,
+    "cache":   bench_cache,
+    "qr":      bench_qr,
+    "verify":  bench_verify,
+    "excel":   bench_excel,
+}
+
+if __name__ == "__main__":
+    for key in sys.argv[1:] or BENCHES:
+        BENCHES[key]()
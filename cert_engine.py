@@ -0,0 +1,704 @@
+"""
+Certificate render engine — Streamlit se alag module.
+
+Streamlit har rerun par app.py dobara chalata hai, is liye jo cheezein
+reruns ke beech zinda rehni chahiye (decoded template, caches) woh yahan
+rehti hain. Yeh module import hone par ek hi baar load hota hai.
+"""
+
+from PIL import Image, ImageDraw, ImageFont
+from reportlab.pdfgen import canvas as pdf_canvas
+from reportlab.lib.pagesizes import landscape, A4
+from reportlab.lib.utils import ImageReader
+from reportlab.lib.colors import HexColor
+from reportlab import rl_config
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from datetime import datetime
+from qr_engine import ERROR_LEVELS, VERIFY_QR_LEVEL, row_runs
+import io, os, json, zlib, hashlib, zipfile, tempfile, threading, multiprocessing as mp, qrcode
+
+# Image streams binary hi likho — ASCII85 size 25% barhata hai aur bina
+# rl_accel ke pure-Python mein bohot slow hai.
+rl_config.useA85 = 0
+
+# ─────────────────────────────────────────────────────────────────
+#  FONTS
+# ─────────────────────────────────────────────────────────────────
+FONTS = {
+    "Arial Regular":          ["arial.ttf",        "DejaVuSans.ttf"],
+    "Arial Bold":             ["arialbd.ttf",       "DejaVuSans-Bold.ttf"],
+    "Arial Italic":           ["ariali.ttf",        "DejaVuSans-Oblique.ttf"],
+    "Arial Bold Italic":      ["arialbi.ttf",       "DejaVuSans-BoldOblique.ttf"],
+    "Calibri Regular":        ["calibri.ttf",       "DejaVuSans.ttf"],
+    "Calibri Bold":           ["calibrib.ttf",      "DejaVuSans-Bold.ttf"],
+    "Calibri Italic":         ["calibrii.ttf",      "DejaVuSans-Oblique.ttf"],
+    "Tahoma Regular":         ["tahoma.ttf",        "DejaVuSans.ttf"],
+    "Tahoma Bold":            ["tahomabd.ttf",      "DejaVuSans-Bold.ttf"],
+    "Verdana Regular":        ["verdana.ttf",       "DejaVuSans.ttf"],
+    "Verdana Bold":           ["verdanab.ttf",      "DejaVuSans-Bold.ttf"],
+    "Trebuchet MS":           ["trebuc.ttf",        "DejaVuSans.ttf"],
+    "Trebuchet Bold":         ["trebucbd.ttf",      "DejaVuSans-Bold.ttf"],
+    "Segoe UI":               ["segoeui.ttf",       "DejaVuSans.ttf"],
+    "Segoe UI Bold":          ["segoeuib.ttf",      "DejaVuSans-Bold.ttf"],
+    "Segoe UI Light":         ["segoeuil.ttf",      "DejaVuSans.ttf"],
+    "Times New Roman":        ["times.ttf",         "DejaVuSerif.ttf"],
+    "Times New Roman Bold":   ["timesbd.ttf",       "DejaVuSerif-Bold.ttf"],
+    "Times New Roman Italic": ["timesi.ttf",        "DejaVuSerif-Italic.ttf"],
+    "Times NR Bold Italic":   ["timesbi.ttf",       "DejaVuSerif-BoldItalic.ttf"],
+    "Georgia Regular":        ["georgia.ttf",       "DejaVuSerif.ttf"],
+    "Georgia Bold":           ["georgiab.ttf",      "DejaVuSerif-Bold.ttf"],
+    "Georgia Italic":         ["georgiai.ttf",      "DejaVuSerif-Italic.ttf"],
+    "Palatino Linotype":      ["pala.ttf",          "DejaVuSerif.ttf"],
+    "Palatino Bold":          ["palab.ttf",         "DejaVuSerif-Bold.ttf"],
+    "Book Antiqua":           ["bkant.ttf",         "DejaVuSerif.ttf"],
+    "Garamond":               ["GARA.TTF",          "DejaVuSerif.ttf"],
+    "Garamond Bold":          ["GARABD.TTF",        "DejaVuSerif-Bold.ttf"],
+    "Courier New":            ["cour.ttf",          "DejaVuSansMono.ttf"],
+    "Courier New Bold":       ["courbd.ttf",        "DejaVuSansMono-Bold.ttf"],
+    "Courier Italic":         ["couri.ttf",         "DejaVuSansMono-Oblique.ttf"],
+    "Consolas":               ["consola.ttf",       "DejaVuSansMono.ttf"],
+    "Consolas Bold":          ["consolab.ttf",      "DejaVuSansMono-Bold.ttf"],
+    "Lucida Console":         ["lucon.ttf",         "DejaVuSansMono.ttf"],
+    "Century Gothic":         ["GOTHIC.TTF",        "DejaVuSans.ttf"],
+    "Century Gothic Bold":    ["GOTHICB.TTF",       "DejaVuSans-Bold.ttf"],
+    "Century Gothic Italic":  ["GOTHICI.TTF",       "DejaVuSans-Oblique.ttf"],
+    "Impact":                 ["impact.ttf",        "DejaVuSans-Bold.ttf"],
+    "Franklin Gothic":        ["framd.ttf",         "DejaVuSans-Bold.ttf"],
+    "Candara Regular":        ["Candara.ttf",       "DejaVuSans.ttf"],
+    "Candara Bold":           ["Candarab.ttf",      "DejaVuSans-Bold.ttf"],
+    "Corbel Regular":         ["corbel.ttf",        "DejaVuSans.ttf"],
+    "Corbel Bold":            ["corbelb.ttf",       "DejaVuSans-Bold.ttf"],
+    "Rockwell":               ["ROCK.TTF",          "DejaVuSerif.ttf"],
+    "Rockwell Bold":          ["ROCKB.TTF",         "DejaVuSerif-Bold.ttf"],
+    "Brush Script MT":        ["BRUSHSCI.TTF",      "DejaVuSerif-Italic.ttf"],
+    "Lucida Handwriting":     ["lhandw.ttf",        "DejaVuSerif-Italic.ttf"],
+    "Lucida Calligraphy":     ["LCALLIG.TTF",       "DejaVuSerif-Italic.ttf"],
+    "Comic Sans MS":          ["comic.ttf",         "DejaVuSans.ttf"],
+    "Comic Sans Bold":        ["comicbd.ttf",       "DejaVuSans-Bold.ttf"],
+    "DejaVu Sans":            ["DejaVuSans.ttf",          "DejaVuSans.ttf"],
+    "DejaVu Sans Bold":       ["DejaVuSans-Bold.ttf",     "DejaVuSans-Bold.ttf"],
+    "DejaVu Serif":           ["DejaVuSerif.ttf",         "DejaVuSerif.ttf"],
+    "DejaVu Serif Bold":      ["DejaVuSerif-Bold.ttf",    "DejaVuSerif-Bold.ttf"],
+    "DejaVu Mono":            ["DejaVuSansMono.ttf",      "DejaVuSansMono.ttf"],
+    "DejaVu Mono Bold":       ["DejaVuSansMono-Bold.ttf", "DejaVuSansMono-Bold.ttf"],
+}
+
+# ─────────────────────────────────────────────────────────────────
+#  PREPARED TEMPLATE  (ek baar decode, har naam par copy)
+# ─────────────────────────────────────────────────────────────────
+TEMPLATE_CACHE_MAX = 4              # itne alag templates memory mein
+_template_cache: "OrderedDict[str, Image.Image]" = OrderedDict()
+
+def template_hash(template: bytes) -> str:
+    """Template bytes ka hash — cache key ke liye."""
+    return hashlib.sha1(template).hexdigest()
+
+def prepare_template(template: bytes, key: str = None) -> Image.Image:
+    """Template decode + RGBA convert sirf ek baar, hash se cache karo.
+
+    Returned image shared hai — isko modify mat karo, ``.copy()`` lo.
+    """
+    key = key or template_hash(template)
+    img = _template_cache.get(key)
+    if img is not None:
+        _template_cache.move_to_end(key)
+        return img
+    img = Image.open(io.BytesIO(template)).convert("RGBA")
+    img.load()
+    img.info["template_hash"] = key
+    _template_cache[key] = img
+    while len(_template_cache) > TEMPLATE_CACHE_MAX:
+        _template_cache.popitem(last=False)
+    return img
+
+# ─────────────────────────────────────────────────────────────────
+#  CORE HELPERS
+# ─────────────────────────────────────────────────────────────────
+FONT_CACHE_MAX = 32                 # (name, size) fonts jo memory mein rahenge
+_font_paths: dict = {}              # FONTS name -> resolved file path (None = koi nahi mila)
+_font_data:  dict = {}              # resolved path -> font file bytes
+
+def resolve_font(name: str):
+    """FONTS fallback list mein jo file pehle mile uska path — sirf ek baar dhoondo."""
+    if name not in _font_paths:
+        _font_paths[name] = None
+        for path in FONTS.get(name, ["DejaVuSans-Bold.ttf"]):
+            try:
+                found = ImageFont.truetype(path, 10)
+            except Exception:
+                continue
+            _font_paths[name] = os.path.abspath(found.path)
+            break
+    return _font_paths[name]
+
+@lru_cache(maxsize=FONT_CACHE_MAX)
+def load_font(name: str, size: int) -> ImageFont.ImageFont:
+    """Font (name, size) ke hisaab se cache — disk sirf pehli baar touch hoti hai."""
+    path = resolve_font(name)
+    if path is None:
+        return ImageFont.load_default()
+    data = _font_data.get(path)
+    if data is None:
+        with open(path, "rb") as f:
+            data = _font_data[path] = f.read()
+    return ImageFont.truetype(io.BytesIO(data), size)
+
+def hex_to_rgba(h: str, alpha: int = 255):
+    h = h.lstrip("#")
+    return (int(h[0:2],16), int(h[2:4],16), int(h[4:6],16), alpha)
+
+_measure = ImageDraw.Draw(Image.new("RGBA", (1,1)))     # sirf textbbox naapne ke liye
+
+def render_cert(name: str, template, cfg: dict, qr: str = None) -> Image.Image:
+    """Naam likha hua certificate (RGB image) — encode nahi hota.
+
+    ``template`` raw bytes ya prepare_template() ki image. ``qr`` diya ho
+    (aur cfg["qr_size"] > 0) to verification QR bhi cfg ki jagah par.
+    """
+    if isinstance(template, (bytes, bytearray)):
+        template = prepare_template(bytes(template))
+    w, h  = template.size
+    font  = load_font(cfg["font"], cfg["size"])
+    px    = int(w * cfg["x"] / 100)
+    py    = int(h * cfg["y"] / 100)
+    bbox  = _measure.textbbox((0,0), name, font=font)
+    tw, th = bbox[2]-bbox[0], bbox[3]-bbox[1]
+    tx, ty = px-tw//2, py-th//2
+    out   = template.convert("RGB")
+    # Poore template ki jagah sirf naam ke bbox jitna tile banao aur wahi
+    # hissa composite karo — output full-size overlay wala hi hai.
+    l, t, r, b = _measure.textbbox((tx, ty), name, font=font)
+    l, t, r, b = max(l,0), max(t,0), min(r,w), min(b,h)
+    if r > l and b > t:
+        tile = Image.new("RGBA", (r-l, b-t), (255,255,255,0))
+        ImageDraw.Draw(tile).text((tx-l, ty-t), name,
+                                  font=font, fill=hex_to_rgba(cfg["color"]))
+        region = Image.alpha_composite(template.crop((l, t, r, b)), tile)
+        out.paste(region.convert("RGB"), (l, t))
+    if qr and cfg.get("qr_size"):
+        _draw_qr(out, qr_modules(qr), cfg)
+    return out
+
+def encode_png(img: Image.Image) -> bytes:
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", dpi=(300,300))
+    return buf.getvalue()
+
+def generate_cert(name: str, template, cfg: dict, qr: str = None) -> bytes:
+    """Certificate PNG banao. ``template`` raw bytes ya prepare_template() ki image."""
+    return encode_png(render_cert(name, template, cfg, qr))
+
+# ─────────────────────────────────────────────────────────────────
+#  VERIFY QR  (har certificate par chhota QR — matrix seedha pixels mein)
+# ─────────────────────────────────────────────────────────────────
+QR_QUIET = 4                        # QR ke gird safed modules (spec ka quiet zone)
+_qr_objs  = threading.local()       # .by_level: level -> QRCode, har thread ka apna
+_BIT2L   = bytes([0, 255]) + bytes(254)     # module 0/1 -> "L" pixel 0/255
+
+def qr_modules(data: str, level: str = VERIFY_QR_LEVEL) -> list:
+    """QR matrix (border ke bagair) — QRCode object reuse hota hai, PNG nahi banta.
+
+    Object har thread ka alag — Streamlit reruns / thread pool ek saath
+    clear()/make() karein to ek dusre ka matrix na bigaadein.
+    """
+    objs = getattr(_qr_objs, "by_level", None)
+    if objs is None:
+        objs = _qr_objs.by_level = {}
+    qr = objs.get(level)
+    if qr is None:
+        qr = objs[level] = qrcode.QRCode(error_correction=ERROR_LEVELS[level], border=0)
+    qr.clear()
+    qr.version = None               # pichle attendee ka version na chipke
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr.modules
+
+def _qr_layout(size: tuple, count: int, cfg: dict):
+    """Template pixels mein (left, top, module px, modules incl. quiet zone)."""
+    w, h = size
+    n    = count + 2 * QR_QUIET
+    box  = max(1, int(w * cfg["qr_size"] / 100) // n)     # poore pixel — QR crisp rahe
+    side = n * box
+    l    = min(max(int(w * cfg["qr_x"] / 100) - side // 2, 0), max(w - side, 0))
+    t    = min(max(int(h * cfg["qr_y"] / 100) - side // 2, 0), max(h - side, 0))
+    return l, t, box, n
+
+def _draw_qr(out: Image.Image, modules: list, cfg: dict):
+    l, t, box, n = _qr_layout(out.size, len(modules), cfg)
+    q    = bytes(QR_QUIET)
+    edge = bytes(n * QR_QUIET)
+    data = edge + b"".join(q + bytes(row) + q for row in modules) + edge
+    side = n * box
+    mask = Image.frombytes("L", (n, n), data.translate(_BIT2L))
+    mask = mask.resize((side, side), Image.Resampling.NEAREST)
+    out.paste((255, 255, 255), (l, t, l + side, t + side))
+    out.paste((0, 0, 0), (l, t, l + side, t + side), mask)
+
+# ─────────────────────────────────────────────────────────────────
+#  PDF
+# ─────────────────────────────────────────────────────────────────
+def _page_fit(iw: int, ih: int):
+    """Image ko landscape A4 par center fit — (pw, ph, scale, x0, y0)."""
+    pw, ph = landscape(A4)
+    sc     = min(pw/iw, ph/ih)
+    return pw, ph, sc, (pw-iw*sc)/2, (ph-ih*sc)/2
+
+def _footer_date() -> str:
+    """PDF footer ki date — render_key mein bhi, taake agle din purani date wala PDF cache se na aaye."""
+    return datetime.now().strftime('%Y-%m-%d')
+
+def _pdf_footer(c, pw: float, name: str, event: str):
+    c.setFont("Helvetica-Bold",9)
+    c.setFillColorRGB(.5,.5,.5)
+    c.drawCentredString(pw/2,14,
+        f"{name}  |  {event}  |  {_footer_date()}")
+
+def cert_to_pdf(cert, name: str, event: str) -> bytes:
+    """Certificate ka PDF. ``cert`` render_cert() ki image (seedha ReportLab ko,
+    koi PNG encode nahi) ya purane tareeqe se PNG bytes."""
+    if isinstance(cert, (bytes, bytearray)):
+        cert = Image.open(io.BytesIO(cert)).convert("RGB")
+    buf    = io.BytesIO()
+    iw, ih = cert.size
+    pw, ph, sc, x0, y0 = _page_fit(iw, ih)
+    c      = pdf_canvas.Canvas(buf, pagesize=(pw,ph))
+    c.drawImage(ImageReader(cert),x0,y0,iw*sc,ih*sc,mask="auto")
+    _pdf_footer(c, pw, name, event)
+    c.save()
+    return buf.getvalue()
+
+# ─────────────────────────────────────────────────────────────────
+#  PROXY RENDER  (screen size template — previews / thumbnails ke liye)
+# ─────────────────────────────────────────────────────────────────
+PREVIEW_WIDTH = 1200                # Tab 3 live preview
+THUMB_WIDTH   = 480                 # preview grid thumbnails
+_proxy_cache: "OrderedDict[tuple, Image.Image]" = OrderedDict()
+
+def proxy_template(template: Image.Image, width: int) -> Image.Image:
+    """Template ki chhoti copy — hash + width par ek hi baar resize hoti hai."""
+    if template.width <= width:
+        return template
+    key = (template.info.get("template_hash"), width)
+    img = _proxy_cache.get(key)
+    if img is not None:
+        _proxy_cache.move_to_end(key)
+        return img
+    img = template.resize((width, max(1, round(template.height * width / template.width))),
+                          Image.Resampling.BILINEAR, reducing_gap=3.0)
+    img.info["template_hash"] = f"{key[0]}@{width}"
+    _proxy_cache[key] = img
+    while len(_proxy_cache) > TEMPLATE_CACHE_MAX * 2:
+        _proxy_cache.popitem(last=False)
+    return img
+
+def render_proxy(name: str, template: Image.Image, cfg: dict, width: int,
+                 qr: str = None) -> Image.Image:
+    """Chhota certificate — x/y % mein hain, sirf font size template ke scale se."""
+    small = proxy_template(template, width)
+    scale = small.width / template.width
+    return render_cert(name, small, dict(cfg, size=max(1, round(cfg["size"] * scale))), qr)
+
+def encode_jpeg(img: Image.Image, quality: int = 85) -> bytes:
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=quality)
+    return buf.getvalue()
+
+# ─────────────────────────────────────────────────────────────────
+#  LIVE PREVIEW  (Tab 3 — sidebar ke har rerun par dobara render nahi)
+# ─────────────────────────────────────────────────────────────────
+PREVIEW_CACHE_MAX = 8               # itne full-size (naam, template, cfg) previews memory mein
+THUMB_CACHE_MAX   = 128             # chhote thumbnails — sasta, zyada rakh sakte hain
+_preview_cache: "OrderedDict[tuple, dict]" = OrderedDict()
+_thumb_cache:   "OrderedDict[tuple, bytes]" = OrderedDict()
+_preview_lock     = threading.Lock()
+
+def _memo(cache: OrderedDict, limit: int, key: tuple, make):
+    with _preview_lock:
+        hit = cache.get(key)
+        if hit is not None:
+            cache.move_to_end(key)
+            return hit
+    value = make()
+    with _preview_lock:
+        cache[key] = value
+        while len(cache) > limit:
+            cache.popitem(last=False)
+    return value
+
+def _preview_key(name: str, template: Image.Image, cfg: dict, *extra) -> tuple:
+    return (name, template.info.get("template_hash"), tuple(sorted(cfg.items()))) + extra
+
+def _full_preview(name: str, template: Image.Image, cfg: dict, qr: str = None) -> dict:
+    return _memo(_preview_cache, PREVIEW_CACHE_MAX, _preview_key(name, template, cfg, qr),
+                 lambda: {"png": generate_cert(name, template, cfg, qr), "pdf": {}})
+
+def preview_png(name: str, template: Image.Image, cfg: dict, qr: str = None) -> bytes:
+    """Full-size preview PNG — (naam, template hash, cfg) same ho to cache se, render nahi."""
+    return _full_preview(name, template, cfg, qr)["png"]
+
+def preview_pdf(name: str, template: Image.Image, cfg: dict, event: str,
+                qr: str = None) -> bytes:
+    """Preview ka PDF — pehli dafa maangne par banta hai, phir cache se.
+
+    Image dobara render hoti hai (memo wala PNG decode nahi hota); key mein
+    footer ki date bhi, taake kal wala PDF aaj purani date na dikhaye.
+    """
+    entry = _full_preview(name, template, cfg, qr)
+    pkey  = (event, _footer_date())
+    pdf   = entry["pdf"].get(pkey)
+    if pdf is None:
+        pdf = entry["pdf"][pkey] = cert_to_pdf(render_cert(name, template, cfg, qr), name, event)
+    return pdf
+
+def preview_thumb(name: str, template: Image.Image, cfg: dict,
+                  width: int = THUMB_WIDTH, qr: str = None) -> bytes:
+    """Screen size JPEG (proxy render) — dikhane ke liye, export ke liye nahi."""
+    return _memo(_thumb_cache, THUMB_CACHE_MAX, _preview_key(name, template, cfg, width, qr),
+                 lambda: encode_jpeg(render_proxy(name, template, cfg, width, qr)))
+
+# ─────────────────────────────────────────────────────────────────
+#  VECTOR PDF  (template image ek baar, naam vector text)
+# ─────────────────────────────────────────────────────────────────
+_pdf_fonts: dict = {}               # resolved TTF path -> ReportLab font name
+
+def pdf_font(name: str) -> str:
+    """FONTS entry wali TTF ReportLab mein register karo (sirf ek baar)."""
+    path = resolve_font(name)
+    if path is None:
+        return "Helvetica-Bold"
+    if path not in _pdf_fonts:
+        rl_name = "Cert-" + os.path.splitext(os.path.basename(path))[0]
+        pdfmetrics.registerFont(TTFont(rl_name, path))
+        _pdf_fonts[path] = rl_name
+    return _pdf_fonts[path]
+
+def _draw_vector_name(c, name: str, size: tuple, cfg: dict, fit: tuple):
+    """Naam usi jagah likho jahan render_cert raster mein likhta — PDF points mein."""
+    w, h  = size
+    _, _, sc, x0, y0 = fit
+    font  = load_font(cfg["font"], cfg["size"])
+    px    = int(w * cfg["x"] / 100)
+    py    = int(h * cfg["y"] / 100)
+    bbox  = _measure.textbbox((0,0), name, font=font)
+    tx    = px - (bbox[2]-bbox[0])//2
+    ty    = py - (bbox[3]-bbox[1])//2
+    base  = ty + font.getmetrics()[0]   # PIL "la" anchor: y = ascender line
+    c.setFont(pdf_font(cfg["font"]), cfg["size"]*sc)
+    c.setFillColor(HexColor(cfg["color"]))
+    c.drawString(x0 + tx*sc, y0 + (h-base)*sc, name)
+
+def _draw_vector_qr(c, qr: str, size: tuple, cfg: dict, fit: tuple):
+    """Verification QR vector rects mein — raster wale QR ki jagah par."""
+    w, h    = size
+    _, _, sc, x0, y0 = fit
+    modules = qr_modules(qr)
+    l, t, box, n = _qr_layout(size, len(modules), cfg)
+    side    = n * box
+    c.setFillColor(HexColor("#ffffff"))
+    c.rect(x0 + l*sc, y0 + (h-t-side)*sc, side*sc, side*sc, stroke=0, fill=1)
+    c.setFillColor(HexColor("#000000"))
+    p = c.beginPath()
+    for y, row in enumerate(modules):
+        top = h - t - (y + QR_QUIET + 1) * box
+        for x, run in row_runs(row):
+            p.rect(x0 + (l + (x + QR_QUIET)*box)*sc, y0 + top*sc, run*box*sc, box*sc)
+    c.drawPath(p, stroke=0, fill=1)
+
+def names_to_pdf(names: list, template, cfg: dict, event: str, qrs: list = None) -> bytes:
+    """Sab attendees ek PDF mein, har ek ka page. Template ek shared form
+    XObject hai — file mein sirf ek baar embed hota hai. ``qrs`` names ke
+    saath wale verification QR texts (optional)."""
+    if isinstance(template, (bytes, bytearray)):
+        template = prepare_template(bytes(template))
+    buf = io.BytesIO()
+    fit = _page_fit(*template.size)
+    pw, ph, sc, x0, y0 = fit
+    c   = pdf_canvas.Canvas(buf, pagesize=(pw,ph))
+    c.beginForm("template")
+    c.drawImage(ImageReader(template.convert("RGB")), x0, y0,
+                template.width*sc, template.height*sc)
+    c.endForm()
+    for name, qr in zip(names, qrs or [None] * len(names)):
+        c.doForm("template")
+        _draw_vector_name(c, name, template.size, cfg, fit)
+        if qr and cfg.get("qr_size"):
+            _draw_vector_qr(c, qr, template.size, cfg, fit)
+        _pdf_footer(c, pw, name, event)
+        c.showPage()
+    c.save()
+    return buf.getvalue()
+
+PDF_BG_DIR = os.path.join(tempfile.gettempdir(), "qr_cert_cache")
+PDF_MODES  = {
+    "raster": "🖼️ Raster — poora certificate image",
+    "vector": "✒️ Vector — template + naam vector text",
+}
+
+PDF_BG_CACHE_MAX = TEMPLATE_CACHE_MAX
+_pdf_bgs: "OrderedDict[str, object]" = OrderedDict()
+
+def pdf_background(template: Image.Image):
+    """Template ka PDF background — JPEG file ya flate (lossless), jo chhota ho.
+
+    Faisla har template hash par ek hi baar hota hai. JPEG file ReportLab bina
+    decode kiye seedha PDF mein daal deta hai (photo templates par yahi jeetta
+    hai); flat / gradient templates par flate chhota hai, us ke liye ImageReader
+    RGB data ek baar nikal kar rakhta hai.
+    """
+    key = template.info.get("template_hash") or template_hash(template.tobytes())
+    def make():
+        path = os.path.join(PDF_BG_DIR, f"{key}.jpg")
+        if not os.path.exists(path):
+            os.makedirs(PDF_BG_DIR, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            template.convert("RGB").save(tmp, format="JPEG", quality=90, optimize=True)
+            os.replace(tmp, path)
+        flate = ImageReader(template.convert("RGB"))
+        return flate if len(zlib.compress(flate.getRGBData())) < os.path.getsize(path) else path
+    return _memo(_pdf_bgs, PDF_BG_CACHE_MAX, key, make)
+
+def cert_to_vector_pdf(name: str, template, cfg: dict, event: str, qr: str = None) -> bytes:
+    """Ek attendee ka PDF — template image + naam vector text (koi raster naam nahi)."""
+    if isinstance(template, (bytes, bytearray)):
+        template = prepare_template(bytes(template))
+    buf = io.BytesIO()
+    fit = _page_fit(*template.size)
+    pw, ph, sc, x0, y0 = fit
+    c   = pdf_canvas.Canvas(buf, pagesize=(pw,ph))
+    c.drawImage(pdf_background(template), x0, y0,
+                template.width*sc, template.height*sc)
+    _draw_vector_name(c, name, template.size, cfg, fit)
+    if qr and cfg.get("qr_size"):
+        _draw_vector_qr(c, qr, template.size, cfg, fit)
+    _pdf_footer(c, pw, name, event)
+    c.save()
+    return buf.getvalue()
+
+# ─────────────────────────────────────────────────────────────────
+#  RENDER CACHE  (disk par — dobara Generate karo to sirf naye naam render)
+# ─────────────────────────────────────────────────────────────────
+RENDER_CACHE_DIR    = os.path.join(PDF_BG_DIR, "renders")
+RENDER_CACHE_MAX_MB = int(os.environ.get("RENDER_CACHE_MB", "1024"))
+RENDER_CACHE_VER    = "1"           # render logic badle to yeh badlo — purani files bekaar
+cache_stats: dict   = {"hits": 0, "misses": 0, "evicted": 0}
+_cache_lock         = threading.Lock()
+_cache_bytes        = None          # disk par cache ka size (pehli zaroorat par scan)
+
+def _font_id(name: str) -> str:
+    """Font file ki pehchan — file badle (size/mtime) to key bhi badle."""
+    path = resolve_font(name)
+    if path is None:
+        return "default"
+    st = os.stat(path)
+    return f"{path}:{st.st_size}:{int(st.st_mtime)}"
+
+def render_key(name: str, tkey: str, cfg: dict, kind: str, event: str = "",
+               pdf_mode: str = "", qr: str = None) -> str:
+    """Output ka content hash — jo cheez file badalti hai woh sab key mein.
+
+    PNG sirf naam + QR text + template + cfg + font par depend karta hai;
+    PDF mein footer (event + aaj ki date) aur pdf_mode bhi aate hain.
+    """
+    parts = [RENDER_CACHE_VER, kind, name, tkey, _font_id(cfg["font"]),
+             json.dumps(cfg, sort_keys=True), qr or ""]
+    if kind == "pdf":
+        parts += [event, pdf_mode, _footer_date()]
+    return hashlib.sha1("\0".join(map(str, parts)).encode()).hexdigest()
+
+def _cache_path(key: str, kind: str) -> str:
+    return os.path.join(RENDER_CACHE_DIR, key[:2], f"{key}.{kind}")
+
+def _cache_files():
+    for root, _, files in os.walk(RENDER_CACHE_DIR):
+        for f in files:
+            path = os.path.join(root, f)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            yield st.st_mtime, st.st_size, path
+
+def cache_get(key: str, kind: str):
+    """Cache se bytes, ya None. Hit par mtime touch — eviction LRU rehta hai."""
+    path = _cache_path(key, kind)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        os.utime(path)
+    except OSError:
+        cache_stats["misses"] += 1
+        return None
+    cache_stats["hits"] += 1
+    return data
+
+def cache_put(key: str, kind: str, data: bytes):
+    """Atomic likho (tmp + replace); limit se upar jaye to purani files hatao."""
+    global _cache_bytes
+    path = _cache_path(key, kind)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp  = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    with _cache_lock:
+        if _cache_bytes is None:
+            _cache_bytes = sum(size for _, size, _ in _cache_files())
+        else:
+            _cache_bytes += len(data)
+        over = _cache_bytes > RENDER_CACHE_MAX_MB * 1024 * 1024
+    if over:
+        evict_render_cache()
+
+def evict_render_cache(max_mb: int = None):
+    """Sabse purani (least recently used) files hatao jab tak size limit ke 90% tak na aaye."""
+    global _cache_bytes
+    limit = (RENDER_CACHE_MAX_MB if max_mb is None else max_mb) * 1024 * 1024
+    with _cache_lock:
+        files = sorted(_cache_files())
+        total = sum(size for _, size, _ in files)
+        if total > limit:
+            target = limit * 9 // 10
+            for _, size, path in files:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                cache_stats["evicted"] += 1
+        _cache_bytes = total
+
+def render_cache_usage():
+    """(files, MB) — UI mein dikhane ke liye."""
+    files = list(_cache_files())
+    return len(files), sum(size for _, size, _ in files) / 1e6
+
+def clear_render_cache():
+    global _cache_bytes
+    with _cache_lock:
+        for _, _, path in _cache_files():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        _cache_bytes = 0
+
+# ─────────────────────────────────────────────────────────────────
+#  BATCH ENGINE  (process pool — har core par certificates)
+# ─────────────────────────────────────────────────────────────────
+DEFAULT_WORKERS = os.cpu_count() or 1
+POOL_MIN_NAMES  = 8                 # is se kam naam ho to pool start karna mehnga hai
+_job: dict = {}                     # har worker process ka prepared template + settings
+
+def _render_one(name: str, img: Image.Image, cfg: dict, event: str,
+                do_png: bool, do_pdf: bool, pdf_mode: str, qr: str = None):
+    if do_pdf and pdf_mode == "vector":
+        pdf  = cert_to_vector_pdf(name, img, cfg, event, qr)
+        png  = generate_cert(name, img, cfg, qr) if do_png else None
+        return png, pdf
+    cert = render_cert(name, img, cfg, qr)
+    png  = encode_png(cert) if do_png else None
+    pdf  = cert_to_pdf(cert, name, event) if do_pdf else None
+    return png, pdf
+
+def _init_job(template: bytes, key: str, *opts):
+    """Worker start par ek baar — template yahin decode hota hai, har task ke saath nahi."""
+    _job["img"], _job["opts"] = prepare_template(template, key), opts
+
+def _render_job(task: tuple):
+    name, qr, do_png, do_pdf = task
+    cfg, event, pdf_mode = _job["opts"]
+    return _render_one(name, _job["img"], cfg, event, do_png, do_pdf, pdf_mode, qr)
+
+def _mp_context():
+    """Streamlit ke threads ke saath fork safe nahi — forkserver (ya spawn) lo."""
+    methods = mp.get_all_start_methods()
+    return mp.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+def _render_tasks(tasks: list, template: bytes, key: str, opts: tuple, workers: int):
+    """(name, qr, do_png, do_pdf) tasks render karo — order wahi, results streaming."""
+    if workers <= 1 or len(tasks) < POOL_MIN_NAMES:
+        img = prepare_template(template, key)
+        cfg, event, pdf_mode = opts
+        for name, qr, do_png, do_pdf in tasks:
+            yield _render_one(name, img, cfg, event, do_png, do_pdf, pdf_mode, qr)
+        return
+    workers = min(workers, len(tasks))
+    chunk   = max(1, min(16, len(tasks) // (workers * 4)))
+    with ProcessPoolExecutor(workers, mp_context=_mp_context(),
+                             initializer=_init_job, initargs=(template, key) + opts) as ex:
+        yield from ex.map(_render_job, tasks, chunksize=chunk)
+
+def generate_batch(names: list, template: bytes, cfg: dict, event: str,
+                   do_png: bool = True, do_pdf: bool = True,
+                   workers: int = DEFAULT_WORKERS, key: str = None,
+                   pdf_mode: str = "raster", cache: bool = False, qrs: list = None):
+    """Har naam ke liye (png, pdf) yield karo — usi order mein jo names ka hai.
+
+    Jo format nahi manga woh None aata hai. ``pdf_mode`` PDF_MODES mein se.
+    ``workers`` > 1 ho to kaam process pool mein bant jata hai; results aate
+    hi yield hote hain (streaming). ``cache=True`` par pehle ke runs ki files
+    disk cache se aati hain — sirf naye/badle certificates render hote hain.
+    ``qrs`` names ke saath wale verification QR texts (optional).
+    """
+    key  = key or template_hash(template)
+    opts = (cfg, event, pdf_mode)
+    qrs  = qrs or [None] * len(names)
+    if not cache:
+        yield from _render_tasks([(n, q, do_png, do_pdf) for n, q in zip(names, qrs)],
+                                 template, key, opts, workers)
+        return
+    # Pehle sirf keys + file hai ya nahi — bytes yield ke waqt padhe jate hain,
+    # taake memory ek certificate jitni rahe aur progress pehle item se chale
+    def cached(k, kind):
+        return bool(k) and os.path.exists(_cache_path(k, kind))
+    plan, tasks = [], []
+    for name, qr in zip(names, qrs):
+        pk   = render_key(name, key, cfg, "png", qr=qr) if do_png else None
+        fk   = render_key(name, key, cfg, "pdf", event, pdf_mode, qr) if do_pdf else None
+        need = (bool(pk) and not cached(pk, "png"), bool(fk) and not cached(fk, "pdf"))
+        plan.append((name, qr, pk, fk, any(need)))
+        if any(need):
+            tasks.append((name, qr) + need)
+    fresh = _render_tasks(tasks, template, key, opts, workers)
+    try:
+        for name, qr, pk, fk, missing in plan:
+            new_png, new_pdf = next(fresh) if missing else (None, None)
+            png = new_png if new_png is not None else cache_get(pk, "png") if pk else None
+            pdf = new_pdf if new_pdf is not None else cache_get(fk, "pdf") if fk else None
+            redo = (bool(pk) and png is None, bool(fk) and pdf is None)
+            if any(redo):           # beech mein evict ho gayi — yahin render kar lo
+                p2, f2 = _render_one(name, prepare_template(template, key), cfg, event,
+                                     *redo, pdf_mode, qr)
+                if redo[0]: png = new_png = p2
+                if redo[1]: pdf = new_pdf = f2
+            if new_png is not None:
+                cache_put(pk, "png", new_png)
+            if new_pdf is not None:
+                cache_put(fk, "pdf", new_pdf)
+            yield png, pdf
+    finally:
+        fresh.close()
+
+# ─────────────────────────────────────────────────────────────────
+#  ZIP EXPORT
+# ─────────────────────────────────────────────────────────────────
+ZIP_MODES = {
+    "fast":  "⚡ Fast — PNG/PDF bina dobara compress kiye",
+    "small": "🗜️ Small — sab kuch deflate",
+}
+PRECOMPRESSED = (".png", ".pdf", ".jpg", ".jpeg", ".zip", ".xlsx")
+
+def zip_compression(arcname: str, mode: str = "fast") -> int:
+    """ZIP entry ka compress_type. 'fast' mein pehle se compressed files STORED."""
+    if mode == "fast" and arcname.lower().endswith(PRECOMPRESSED):
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+def zip_add(zf: zipfile.ZipFile, arcname: str, data: bytes, mode: str = "fast"):
+    zf.writestr(arcname, data, compress_type=zip_compression(arcname, mode))
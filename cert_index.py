@@ -0,0 +1,263 @@
+"""
+Issued certificates index — ?page=verify isi se jawab deta hai.
+
+Certificates generate hote waqt har ID (qr_engine.cert_id) ke saath naam,
+event aur category ek binary file mein likhe jate hain. Verify page
+registrations CSV ko haath nahi lagata — file mmap hoti hai aur lookup
+sirf chand bytes parhta hai, chahe lakhon certificates hon.
+
+File layout (little-endian):
+    header     magic "QRCIX1", bits (u8), pad (u8), count (u32)
+    directory  2**bits + 1 x u32 — ID ke pehle ``bits`` bits ka bucket ->
+               pehla record number (IDs HMAC hain, is liye buckets barabar bharte hain)
+    records    count x (id 10 bytes, data offset u32, data length u16) — ID ke order mein
+    data       "name \\x1f event \\x1f category" UTF-8
+
+Naye certificates poori file dobara nahi likhte — DELTA_FILE ke aakhir mein
+(id 10 bytes, length u16, data) records jurte hain, aur jab delta index ke
+hisaab se bada ho jaye tab ek baar merge. Likhne wale (app aur cli.py,
+alag processes) LOCK_FILE par file lock lete hain; padhne wale lock nahi
+lete — index os.replace se badalta hai aur delta sirf barhta hai.
+"""
+
+import os, mmap, base64, binascii, struct, threading
+from contextlib import contextmanager
+try:
+    import fcntl
+except ImportError:                 # Windows
+    fcntl = None
+    import msvcrt
+
+# ─────────────────────────────────────────────────────────────────
+#  FILE
+# ─────────────────────────────────────────────────────────────────
+INDEX_FILE = "issued_certs.idx"
+DELTA_FILE = INDEX_FILE + ".delta"  # merge se pehle ke naye / badle certificates
+LOCK_FILE  = INDEX_FILE + ".lock"
+MAGIC      = b"QRCIX1"
+HEADER     = struct.Struct("<6sBxI")
+RECORD     = struct.Struct("<10sIH")
+DELTA_REC  = struct.Struct("<10sH")
+ID_BYTES   = 10
+SEP        = "\x1f"
+MERGE_MIN  = 4096                   # itne delta records se kam ho to merge nahi
+
+_lock  = threading.Lock()
+_open  = {"stat": None, "file": None, "mm": None}  # is process ka mmap (file badle to dobara)
+_delta = {"key": None, "pos": 0, "map": {}, "new": 0}  # delta file jitni padh li
+
+def _id_bytes(cid: str):
+    """16-character base32 ID -> 10 bytes, ghalat ID par None."""
+    cid = (cid or "").strip().upper()
+    if len(cid) != 16:
+        return None
+    try:
+        return base64.b32decode(cid)
+    except (ValueError, binascii.Error):
+        return None
+
+def _bucket(key: bytes, bits: int) -> int:
+    return int.from_bytes(key[:3], "big") >> (24 - bits)
+
+def _close():
+    if _open["mm"] is not None:
+        _open["mm"].close()
+        _open["file"].close()
+    _open.update(stat=None, file=None, mm=None)
+
+def _mapped():
+    """Index file ka mmap — file replace hui ho (naye certificates) to dobara map."""
+    try:
+        st = os.stat(INDEX_FILE)
+    except FileNotFoundError:
+        _close()
+        return None
+    stat = (st.st_ino, st.st_mtime_ns, st.st_size)
+    if _open["stat"] != stat:
+        _close()
+        f = open(INDEX_FILE, "rb")
+        _open.update(stat=stat, file=f, mm=mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    return _open["mm"]
+
+@contextmanager
+def _file_lock():
+    """Dusre processes (cli.py, doosra app) ke writers se bachao."""
+    with open(LOCK_FILE, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def _delta_map(mm) -> dict:
+    """Delta file ke records {id bytes: data bytes} — sirf naya hissa padha jata hai.
+
+    ``new`` mein woh IDs ginti hoti hain jo index (mm) mein nahi — kul count ke liye.
+    Aadha-likha aakhri record tab tak chhor diya jata hai jab tak poora na ho.
+    """
+    try:
+        f = open(DELTA_FILE, "rb")
+    except FileNotFoundError:
+        _delta.update(key=None, pos=0, map={}, new=0)
+        return _delta["map"]
+    with f:
+        st  = os.fstat(f.fileno())
+        key = (st.st_ino, _open["stat"])        # merge ke baad index bhi badalta hai
+        if _delta["key"] != key or st.st_size < _delta["pos"]:
+            _delta.update(key=key, pos=0, map={}, new=0)
+        if st.st_size == _delta["pos"]:
+            return _delta["map"]
+        f.seek(_delta["pos"])
+        buf, pos = f.read(), 0
+    dmap = _delta["map"]
+    while pos + DELTA_REC.size <= len(buf):
+        key, ln = DELTA_REC.unpack_from(buf, pos)
+        end = pos + DELTA_REC.size + ln
+        if end > len(buf):
+            break
+        if key not in dmap and _find(mm, key) is None:
+            _delta["new"] += 1
+        dmap[key] = buf[pos + DELTA_REC.size:end]
+        pos = end
+    _delta["pos"] += pos
+    return dmap
+
+def _layout(mm):
+    magic, bits, count = HEADER.unpack_from(mm, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{INDEX_FILE} index file nahi hai")
+    recs = HEADER.size + 4 * ((1 << bits) + 1)
+    return bits, count, recs, recs + RECORD.size * count
+
+def _entries(mm) -> dict:
+    """Poora index — {id bytes: data bytes} (sirf naye certificates merge karte waqt)."""
+    bits, count, recs, data = _layout(mm)
+    out = {}
+    for i in range(count):
+        key, off, ln = RECORD.unpack_from(mm, recs + RECORD.size * i)
+        out[key] = bytes(mm[data + off:data + off + ln])
+    return out
+
+def _write(entries: dict):
+    keys = sorted(entries)
+    bits = min(max(len(keys).bit_length(), 8), 20)      # ~1 record per bucket
+    dirs = [0] * ((1 << bits) + 1)
+    for key in keys:
+        dirs[_bucket(key, bits) + 1] += 1
+    for b in range(1, len(dirs)):
+        dirs[b] += dirs[b - 1]
+    recs, blob = bytearray(), bytearray()
+    for key in keys:
+        recs += RECORD.pack(key, len(blob), len(entries[key]))
+        blob += entries[key]
+    tmp = f"{INDEX_FILE}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, bits, len(keys)))
+        f.write(struct.pack(f"<{len(dirs)}I", *dirs))
+        f.write(recs)
+        f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    _close()                        # Windows par mapped file replace nahi hoti
+    os.replace(tmp, INDEX_FILE)
+
+def _find(mm, key: bytes):
+    """Index mein ID ka data (bytes) — bucket ke andar binary search; nahi to None."""
+    if mm is None:
+        return None
+    bits, count, recs, data = _layout(mm)
+    lo, hi = struct.unpack_from("<2I", mm, HEADER.size + 4 * _bucket(key, bits))
+    while lo < hi:
+        mid = (lo + hi) // 2
+        pos = recs + RECORD.size * mid
+        cur = mm[pos:pos + ID_BYTES]
+        if cur < key:
+            lo = mid + 1
+        elif cur > key:
+            hi = mid
+        else:
+            _, off, ln = RECORD.unpack_from(mm, pos)
+            return bytes(mm[data + off:data + off + ln])
+    return None
+
+def _view():
+    """(index mmap, delta map) ek saath — padhte waqt merge ho gaya to dobara.
+
+    Merge pehle index badalta hai phir delta hatata hai, is liye delta padhne
+    ke baad index wahi hai to dono mil kar poora data dete hain.
+    """
+    while True:
+        mm   = _mapped()
+        dmap = _delta_map(mm)
+        try:
+            st = os.stat(INDEX_FILE)
+            if _open["stat"] == (st.st_ino, st.st_mtime_ns, st.st_size):
+                return mm, dmap
+        except FileNotFoundError:
+            if mm is None:
+                return mm, dmap
+
+def _current(mm, dmap: dict, key: bytes):
+    return dmap[key] if key in dmap else _find(mm, key)
+
+# ─────────────────────────────────────────────────────────────────
+#  PUBLIC API
+# ─────────────────────────────────────────────────────────────────
+def issue_certs(certs) -> int:
+    """Generate hue certificates index mein daalo — (cert_id, name, event, category).
+
+    Pehle se maujood IDs ka data naye se badal jata hai; jo ID pehle se
+    bilkul wahi hai woh dobara nahi likhi jati. Naye records delta file mein
+    jurte hain, poora index sirf merge par likha jata hai. Index mein kul
+    kitne certificates hain woh return hota hai.
+    """
+    with _lock, _file_lock():
+        mm, dmap = _view()
+        out  = bytearray()
+        for cid, name, event, category in certs:
+            key = _id_bytes(cid)
+            if key is None:
+                continue
+            val = SEP.join(str(v).replace(SEP, " ") for v in (name, event, category)).encode()
+            if _current(mm, dmap, key) != val:
+                out += DELTA_REC.pack(key, len(val)) + val
+        if out:
+            with open(DELTA_FILE, "ab") as f:
+                f.truncate(_delta["pos"])           # crash ka aadha record hatao
+                f.write(out)
+                f.flush()
+                os.fsync(f.fileno())
+            dmap = _delta_map(mm)
+        count = (_layout(mm)[1] if mm is not None else 0) + _delta["new"]
+        if len(dmap) >= max(MERGE_MIN, count // 8):
+            entries = _entries(mm) if mm is not None else {}
+            entries.update(dmap)
+            _write(entries)
+            os.remove(DELTA_FILE)               # index ke baad — beech mein koi kuch na khoye
+            _delta.update(key=None, pos=0, map={}, new=0)
+        return count
+
+def lookup_cert(cid: str):
+    """ID ka certificate — {"name", "event", "category"} ya None (fake / nahi mila)."""
+    key = _id_bytes(cid)
+    if key is None:
+        return None
+    with _lock:
+        val = _current(*_view(), key)
+    if val is None:
+        return None
+    name, event, category = val.decode().split(SEP)
+    return {"name": name, "event": event, "category": category}
+
+def issued_count() -> int:
+    with _lock:
+        mm, _ = _view()
+        return (_layout(mm)[1] if mm is not None else 0) + _delta["new"]
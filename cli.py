@@ -0,0 +1,245 @@
+"""
+Headless certificate generator — browser / Streamlit ke bagair bade batches.
+
+Wahi pipeline jo Tab 4 chalata hai (cert_engine.generate_batch, process
+pool, verification QR, verify index), bas command line se — nightly job
+hazaaron certificates bana sakti hai.
+
+RUN:  python cli.py template.png --cfg cfg.json --out certs.zip
+      python cli.py template.png --cfg cfg.json --regs registrations.csv --out certs/
+      python cli.py template.png --cfg cfg.json --event tech-summit-2026 --pdf vector --out out.zip
+      python cli.py template.png --cfg cfg.json --event tech-summit-2026 --backend sqlite --out out.zip
+
+cfg.json mein wahi keys jo app ka cur_cfg() deta hai:
+      {"x": 50, "y": 60, "size": 72, "color": "#1a1a1a", "font": "Arial Bold",
+       "qr_size": 8, "qr_x": 90, "qr_y": 84}
+
+Beech mein ruk jaye (Ctrl+C, crash) to wahi command dobara chalao — checkpoint
+se aage shuru hota hai. ZIP output pehle <out>.parts/ folder mein banta hai,
+aakhir mein ZIP; folder output mein files seedha wahin.
+"""
+
+from cert_engine import (generate_batch, template_hash, zip_add, DEFAULT_WORKERS,
+                         PDF_MODES, ZIP_MODES)
+from qr_engine import cert_id, verify_url
+from cert_index import issue_certs
+from reg_store import (load_registrations, reg_key, event_path, event_exists,
+                       CSV_HEADERS, DEFAULT_EVENT, DB_FILE)
+import reg_store
+import os, re, csv, sys, json, time, shutil, sqlite3, hashlib, zipfile, argparse
+
+CONFIG_FILE = "config.json"         # app.py wali — app URL + event settings
+CHECKPOINT  = ".checkpoint.json"    # output (ya .parts) folder ke andar
+CFG_DEFAULTS = {                    # app ke session defaults jaise
+    "x": 50, "y": 60, "size": 72, "color": "#1a1a1a", "font": "Arial Bold",
+    "qr_size": 8, "qr_x": 90, "qr_y": 84,
+}
+
+# ─────────────────────────────────────────────────────────────────
+#  INPUT
+# ─────────────────────────────────────────────────────────────────
+def _read_json(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _unique(rows) -> list:
+    """Har (event, roll_no) ek baar — baad wali row pehli ki jagah (store jaisa upsert)."""
+    out, keys = [], {}
+    for row in rows:
+        k = reg_key(row)
+        if k is not None and k in keys:
+            out[keys[k]] = row
+            continue
+        if k is not None:
+            keys[k] = len(out)
+        out.append(row)
+    return out
+
+def read_registrations(path: str) -> list:
+    """registrations.csv ya registrations.db (SQLite) file se rows."""
+    if path.lower().endswith((".db", ".sqlite", ".sqlite3")):
+        con = sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True)
+        try:
+            cur = con.execute(f"SELECT {','.join(CSV_HEADERS)} FROM registrations ORDER BY id")
+            return _unique(dict(zip(CSV_HEADERS, row)) for row in cur)
+        finally:
+            con.close()
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return _unique({k: row.get(k) or "" for k in CSV_HEADERS} for row in csv.DictReader(f))
+
+def pick_backend(event_id: str, backend: str) -> str:
+    """--event ka store — app REG_BACKEND=sqlite se chala ho aur yahan env na ho
+    to bhi registrations.db wala event SQLite se padha jaye."""
+    if backend != "auto":
+        return backend
+    return "sqlite" if os.path.exists(event_path(event_id, DB_FILE)) else reg_store.BACKEND
+
+# ─────────────────────────────────────────────────────────────────
+#  OUTPUT
+# ─────────────────────────────────────────────────────────────────
+def _safe(part: str) -> str:
+    """Naam file / folder ke liye — slash aur '..' se bahar nahi ja sakta."""
+    return re.sub(r'[\\/:*?"<>|\x00-\x1f]', "_", part).strip().lstrip(".") or "_"
+
+def cert_paths(rec: dict) -> tuple:
+    """(png, pdf) relative paths — app ke ZIP jaisa PNG/<category>/<name>, Roll No ke saath
+    taake same naam wale ek dusre ko overwrite na karein."""
+    cat  = _safe(rec.get("category") or "Other")
+    stem = _safe(rec["name"] + (f"_{rec['roll_no']}" if rec.get("roll_no") else ""))
+    return f"PNG/{cat}/{stem}.png", f"PDF/{cat}/{stem}.pdf"
+
+def _write(root: str, rel: str, data: bytes):
+    path = os.path.join(root, *rel.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+def _pack_zip(src: str, out: str, mode: str):
+    """Folder ki sab files (checkpoint ke ilawa) ZIP mein — atomic replace."""
+    tmp = f"{out}.{os.getpid()}.tmp"
+    with zipfile.ZipFile(tmp, "w", allowZip64=True) as zf:
+        for d, dirs, files in os.walk(src):
+            dirs.sort()
+            for fn in sorted(files):
+                if fn == CHECKPOINT:
+                    continue
+                path = os.path.join(d, fn)
+                with open(path, "rb") as f:
+                    zip_add(zf, os.path.relpath(path, src).replace(os.sep, "/"), f.read(), mode)
+    os.replace(tmp, out)
+
+# ─────────────────────────────────────────────────────────────────
+#  CHECKPOINT
+# ─────────────────────────────────────────────────────────────────
+def _rows_hash(rows):
+    h = hashlib.sha256()
+    for rec in rows:
+        h.update(json.dumps([rec.get(k, "") for k in CSV_HEADERS]).encode() + b"\n")
+    return h
+
+def load_checkpoint(work: str, run_key: str, regs: list) -> int:
+    """Pichle run mein kitne certificates ban chuke — settings ya wo rows badli hon to 0."""
+    ck   = _read_json(os.path.join(work, CHECKPOINT))
+    done = ck.get("done", 0)
+    if ck.get("run") != run_key or not 0 < done <= len(regs):
+        return 0
+    return done if _rows_hash(regs[:done]).hexdigest() == ck.get("rows") else 0
+
+def save_checkpoint(work: str, run_key: str, done: int, rows_hash):
+    path = os.path.join(work, CHECKPOINT)
+    tmp  = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"run": run_key, "done": done, "rows": rows_hash.hexdigest()}, f)
+    os.replace(tmp, path)
+
+# ─────────────────────────────────────────────────────────────────
+#  MAIN
+# ─────────────────────────────────────────────────────────────────
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Certificates bina browser ke generate karo.")
+    p.add_argument("template", help="certificate template (PNG / JPG)")
+    p.add_argument("--cfg", required=True, help="text / QR settings JSON (cur_cfg() wali keys)")
+    src = p.add_mutually_exclusive_group()
+    src.add_argument("--regs", help="registrations.csv ya registrations.db file")
+    src.add_argument("--event", default=DEFAULT_EVENT,
+                     help="app ke store ka event ID (default: %(default)s)")
+    p.add_argument("--backend", choices=("auto", "csv", "sqlite"), default="auto",
+                   help="--event ka store — auto: event mein registrations.db ho to "
+                        "sqlite, warna REG_BACKEND")
+    p.add_argument("--out", required=True, help="output — .zip file ya folder")
+    p.add_argument("--format", choices=("png", "pdf", "both"), default="both")
+    p.add_argument("--pdf", choices=list(PDF_MODES), default="raster", help="PDF mode")
+    p.add_argument("--zip-mode", choices=list(ZIP_MODES), default="fast")
+    p.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    p.add_argument("--event-name", help="PDF footer / verify ID ka event (default: config se)")
+    p.add_argument("--app-url", help="verification QR ka app URL (default: config.json se)")
+    p.add_argument("--every", type=int, default=200, help="itne certificates par checkpoint")
+    p.add_argument("--cache", action="store_true", help="render cache use karo (app wala)")
+    p.add_argument("--restart", action="store_true", help="checkpoint chhor kar shuru se")
+    p.add_argument("--no-issue", action="store_true", help="verify index mein mat daalo")
+    return p.parse_args(argv)
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.every < 1:
+        sys.exit("--every kam se kam 1")
+    root_cfg = _read_json(CONFIG_FILE)
+    if args.regs:
+        regs, ev_cfg = read_registrations(args.regs), root_cfg
+    else:
+        if not event_exists(args.event):
+            sys.exit(f"Event nahi mila: {args.event}")
+        reg_store.BACKEND = pick_backend(args.event, args.backend)
+        regs   = load_registrations(args.event)
+        ev_cfg = root_cfg if args.event == DEFAULT_EVENT else \
+                 _read_json(event_path(args.event, CONFIG_FILE))
+    event   = args.event_name or ev_cfg.get("event_name") or "Certificate of Participation"
+    app_url = root_cfg.get("app_url", "") if args.app_url is None else args.app_url
+    with open(args.template, "rb") as f:
+        template = f.read()
+    with open(args.cfg, "r", encoding="utf-8") as f:
+        cfg = {**CFG_DEFAULTS, **json.load(f)}
+    do_png, do_pdf = args.format in ("png", "both"), args.format in ("pdf", "both")
+    if not regs:
+        print("Koi registration nahi — kuch generate nahi hua.")
+        return 0
+
+    as_zip  = args.out.lower().endswith(".zip")
+    work    = f"{args.out}.parts" if as_zip else args.out
+    tkey    = template_hash(template)
+    run_key = hashlib.sha256(json.dumps(
+        [tkey, cfg, event, app_url, do_png, do_pdf, args.pdf], sort_keys=True).encode()).hexdigest()
+    start   = 0 if args.restart else load_checkpoint(work, run_key, regs)
+    if as_zip and not start and os.path.isdir(work):
+        shutil.rmtree(work)                     # purane run ki files ZIP mein na jayein
+    os.makedirs(work, exist_ok=True)
+    h       = _rows_hash(regs[:start])
+    if start:
+        print(f"Checkpoint se resume — {start}/{len(regs)} pehle se bane hue")
+
+    def rec_event(rec: dict) -> str:
+        return rec.get("event") or event
+
+    todo = regs[start:]
+    qrs  = [verify_url(app_url, cert_id(rec_event(r), r["roll_no"])) if r.get("roll_no") else None
+            for r in todo]
+    t0, done = time.monotonic(), start
+    results  = generate_batch([r["name"] for r in todo], template, cfg, event, do_png, do_pdf,
+                              max(1, args.workers), key=tkey, pdf_mode=args.pdf,
+                              cache=args.cache, qrs=qrs)
+    try:
+        for rec, (png, pdf) in zip(todo, results):
+            png_rel, pdf_rel = cert_paths(rec)
+            if png: _write(work, png_rel, png)
+            if pdf: _write(work, pdf_rel, pdf)
+            h.update(json.dumps([rec.get(k, "") for k in CSV_HEADERS]).encode() + b"\n")
+            done += 1
+            if (done - start) % args.every == 0 or done == len(regs):
+                save_checkpoint(work, run_key, done, h)
+                rate = (done - start) / max(time.monotonic() - t0, 1e-9)
+                print(f"  {done}/{len(regs)}  ({rate:.1f}/s)", flush=True)
+    except KeyboardInterrupt:
+        save_checkpoint(work, run_key, done, h)
+        print(f"\nRuk gaya — {done}/{len(regs)} bane. Wahi command dobara chalao, yahin se shuru hoga.")
+        return 130
+    finally:
+        results.close()
+
+    if as_zip:
+        _pack_zip(work, args.out, args.zip_mode)
+        shutil.rmtree(work)
+    else:
+        os.remove(os.path.join(work, CHECKPOINT))
+    if not args.no_issue:
+        issued = issue_certs((cert_id(rec_event(r), r["roll_no"]), r["name"],
+                              rec_event(r), r.get("category", "Other"))
+                             for r in regs if r.get("roll_no"))
+        print(f"🔏 {issued} verify index mein")
+    print(f"✅ {len(regs)} certificates → {args.out}  ({time.monotonic() - t0:.1f} s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Registrations ka Excel export — write-only (streaming) workbook.
+
+Styles ek hi baar named styles ban kar workbook mein register hote hain;
+har cell ko sirf style ka naam milta hai, naye Font/Fill objects nahi. Rows seedha XML stream mein likhi jati hain, poori sheet memory mein
+nahi banti. Category summary pandas groupby se.
+"""
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import NamedStyle, Font, PatternFill, Alignment, Border, Side
+from datetime import datetime
+import io
+import pandas as pd
+
+# ─────────────────────────────────────────────────────────────────
+#  STYLES  (workbook mein ek baar)
+# ─────────────────────────────────────────────────────────────────
+_HF     = dict(fill_type="solid", fgColor="1E1B4B")
+_HF2    = dict(fill_type="solid", fgColor="0B132B")
+_BORDER = dict(bottom=Side(style="thin", color="334466"))
+
+STYLES = {
+    "title":   dict(font=Font(bold=True, color="FFD159", size=14), fill=_HF2,
+                    alignment=dict(horizontal="center", vertical="center")),
+    "info":    dict(font=Font(color="7ECEFD", size=10), fill=_HF,
+                    alignment=dict(horizontal="center")),
+    "head":    dict(font=Font(bold=True, color="FFFFFF", size=12), fill=_HF,
+                    alignment=dict(horizontal="center")),
+    "title2":  dict(font=Font(bold=True, color="FFD159", size=13), fill=_HF2,
+                    alignment=dict(horizontal="center")),
+    # summary rows par bhi _HF — purana export bhi yahi fill lagata tha
+    "sum_cat": dict(font=Font(bold=True, color="FFD159"), fill=_HF),
+    "sum_val": dict(font=Font(color="E0E0E0"), fill=_HF),
+}
+for _parity, _color in (("even", "0F1B35"), ("odd", "1A2550")):
+    for _align in ("center", "left"):
+        STYLES[f"row_{_parity}_{_align}"] = dict(
+            font=Font(color="E0E0E0", size=11), border=_BORDER,
+            fill=dict(fill_type="solid", fgColor=_color),
+            alignment=dict(horizontal=_align, vertical="center"))
+
+COLUMNS = [("#",5),("Full Name",28),("Roll No",16),
+           ("Department",24),("Batch",14),("Category",16),
+           ("Date",14),("Time",10)]
+FIELDS  = ["name","roll_no","department","batch","category","date","time"]
+CENTER  = {1, 6, 7, 8}                 # in columns ka text center mein
+
+def _register_styles(wb: Workbook):
+    for name, kw in STYLES.items():
+        wb.add_named_style(NamedStyle(
+            name=name, font=kw["font"],
+            fill=PatternFill(**kw["fill"]),
+            border=Border(**kw.get("border", {})),
+            alignment=Alignment(**kw.get("alignment", {}))))
+
+def _cells(ws, values, styles: list) -> list:
+    out = []
+    for value, style in zip(values, styles):
+        c = WriteOnlyCell(ws, value)
+        c.style = style             # named style — workbook mein pehle se registered
+        out.append(c)
+    return out
+
+# ─────────────────────────────────────────────────────────────────
+#  SUMMARY
+# ─────────────────────────────────────────────────────────────────
+def category_summary(regs: list) -> pd.DataFrame:
+    """Category, Count, Members — categories usi order mein jis mein pehli baar aayin."""
+    df = pd.DataFrame(regs, columns=["name", "roll_no", "category"])
+    df = df.fillna({"name": "", "roll_no": "", "category": "Other"})
+    df["member"] = df["name"] + " [" + df["roll_no"] + "]"
+    g  = df.groupby("category", sort=False)["member"]
+    return pd.DataFrame({"Count": g.size(), "Members": g.agg(", ".join)}).reset_index()
+
+# ─────────────────────────────────────────────────────────────────
+#  WORKBOOK
+# ─────────────────────────────────────────────────────────────────
+def build_excel(regs: list, event: dict) -> bytes:
+    """Styled .xlsx — Registrations sheet + Category Summary.
+
+    ``event`` mein event_name, event_date, event_venue, event_topic, organizer.
+    """
+    wb = Workbook(write_only=True)
+    _register_styles(wb)
+
+    ws = wb.create_sheet("Registrations")
+    for ci, (_, w) in enumerate(COLUMNS, 1):
+        ws.column_dimensions[chr(64 + ci)].width = w
+    ws.merged_cells.add("A1:H1")
+    ws.merged_cells.add("A2:H2")
+    ws.row_dimensions[1].height = 34
+    ws.row_dimensions[2].height = 18
+    ws.row_dimensions[3].height = 22
+    ws.sheet_format.defaultRowHeight = 20        # data rows — har row ka alag entry nahi
+    ws.sheet_format.customHeight     = True
+
+    try:
+        day = datetime.strptime(event["event_date"], "%Y-%m-%d").strftime("%A")
+    except Exception:
+        day = ""
+    ws.append(_cells(ws, [f"  {event['event_name']} — Registration Data"], ["title"]))
+    ws.append(_cells(ws, [f"Date: {event['event_date']} ({day})  |  "
+                          f"Venue: {event['event_venue']}  |  "
+                          f"Topic: {event['event_topic']}  |  "
+                          f"Organizer: {event['organizer']}  |  "
+                          f"Total: {len(regs)}"], ["info"]))
+    ws.append(_cells(ws, [h for h, _ in COLUMNS], ["head"] * len(COLUMNS)))
+
+    row_styles = {
+        parity: [f"row_{parity}_{'center' if ci in CENTER else 'left'}"
+                 for ci in range(1, len(COLUMNS) + 1)]
+        for parity in ("even", "odd")
+    }
+    for ri, rec in enumerate(regs, 4):
+        ws.append(_cells(ws, [ri - 3] + [rec.get(f, "") for f in FIELDS],
+                         row_styles["even" if ri % 2 == 0 else "odd"]))
+
+    ws2 = wb.create_sheet("Category Summary")
+    for col, w in (("A", 20), ("B", 10), ("C", 80)):
+        ws2.column_dimensions[col].width = w
+    ws2.merged_cells.add("A1:C1")
+    ws2.row_dimensions[1].height = 28
+    ws2.append(_cells(ws2, ["Category-wise Summary"], ["title2"]))
+    ws2.append(_cells(ws2, ["Category", "Count", "Members (Roll No)"], ["head"] * 3))
+    for cat, count, members in category_summary(regs).itertuples(index=False):
+        ws2.append(_cells(ws2, [cat, int(count), members], ["sum_cat", "sum_val", "sum_val"]))
+
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
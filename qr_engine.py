@@ -0,0 +1,167 @@
+"""
+QR engine — registration / poster QR codes, cache ke saath.
+
+Ek URL ka matrix sirf ek baar banta hai; PNG / SVG / PDF usi matrix se
+likhe jate hain. SVG aur PDF vector hain — poster kisi bhi size par print
+karo, blur nahi hota.
+
+Certificate verification ke liye har attendee ki signed ID (HMAC) bhi
+yahin banti hai — secret ke bagair koi nayi valid ID nahi bana sakta.
+"""
+
+from PIL import Image, ImageColor
+from reportlab.pdfgen import canvas as pdf_canvas
+from reportlab.lib.colors import HexColor
+from functools import lru_cache
+import io, os, hmac, base64, hashlib, secrets, threading, qrcode
+
+# ─────────────────────────────────────────────────────────────────
+#  SETTINGS
+# ─────────────────────────────────────────────────────────────────
+ERROR_LEVELS = {
+    "L": qrcode.constants.ERROR_CORRECT_L,     # ~7%  — sabse chhota QR
+    "M": qrcode.constants.ERROR_CORRECT_M,     # ~15%
+    "Q": qrcode.constants.ERROR_CORRECT_Q,     # ~25%
+    "H": qrcode.constants.ERROR_CORRECT_H,     # ~30% — print / logo ke liye
+}
+QR_FORMATS = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+    "pdf": "application/pdf",
+}
+QR_CACHE_MAX = 256                  # (url, style, format) results memory mein
+
+# ─────────────────────────────────────────────────────────────────
+#  MATRIX  (encode sirf ek baar — har format isi se)
+# ─────────────────────────────────────────────────────────────────
+@lru_cache(maxsize=QR_CACHE_MAX)
+def qr_matrix(data: str, level: str = "H") -> tuple:
+    """QR modules (border ke bagair) — har row bytes, 1 = dark."""
+    qr = qrcode.QRCode(error_correction=ERROR_LEVELS[level], border=0)
+    qr.add_data(data)
+    qr.make(fit=True)
+    return tuple(bytes(row) for row in qr.get_matrix())
+
+def row_runs(row: bytes):
+    """Ek row ke dark modules ke (start, length) — SVG/PDF mein har run ek rect."""
+    x, n = 0, len(row)
+    while x < n:
+        if row[x]:
+            s = x
+            while x < n and row[x]:
+                x += 1
+            yield s, x - s
+        else:
+            x += 1
+
+# ─────────────────────────────────────────────────────────────────
+#  FORMATS
+# ─────────────────────────────────────────────────────────────────
+def _png(matrix: tuple, box: int, border: int, fill: str, back: str) -> bytes:
+    n    = len(matrix) + 2 * border
+    edge = bytes(n * border)                    # upar / neeche ki khali rows
+    img  = Image.new("P", (n, n), 0)
+    img.putpalette(ImageColor.getrgb(back) + ImageColor.getrgb(fill))
+    img.frombytes(edge + b"".join(bytes(border) + row + bytes(border) for row in matrix) + edge)
+    img  = img.resize((n * box, n * box), Image.Resampling.NEAREST)
+    buf  = io.BytesIO()
+    img.save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+def _svg(matrix: tuple, box: int, border: int, fill: str, back: str) -> bytes:
+    n    = len(matrix) + 2 * border
+    path = "".join(f"M{x+border},{y+border}h{w}v1h-{w}z"
+                   for y, row in enumerate(matrix) for x, w in row_runs(row))
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {n} {n}" '
+            f'width="{n*box}" height="{n*box}" shape-rendering="crispEdges">'
+            f'<rect width="{n}" height="{n}" fill="{back}"/>'
+            f'<path d="{path}" fill="{fill}"/></svg>').encode()
+
+def _hex(color: str) -> str:
+    return "#%02x%02x%02x" % ImageColor.getrgb(color)[:3]
+
+def _pdf(matrix: tuple, box: int, border: int, fill: str, back: str) -> bytes:
+    n   = len(matrix) + 2 * border
+    buf = io.BytesIO()
+    c   = pdf_canvas.Canvas(buf, pagesize=(n * box, n * box))
+    c.setFillColor(HexColor(_hex(back)))
+    c.rect(0, 0, n * box, n * box, stroke=0, fill=1)
+    c.setFillColor(HexColor(_hex(fill)))
+    p = c.beginPath()
+    for y, row in enumerate(matrix):
+        top = (n - border - y - 1) * box         # PDF ka origin neeche left
+        for x, w in row_runs(row):
+            p.rect((x + border) * box, top, w * box, box)
+    c.drawPath(p, stroke=0, fill=1)
+    c.save()
+    return buf.getvalue()
+
+_WRITERS = {"png": _png, "svg": _svg, "pdf": _pdf}
+
+# ─────────────────────────────────────────────────────────────────
+#  PUBLIC API
+# ─────────────────────────────────────────────────────────────────
+@lru_cache(maxsize=QR_CACHE_MAX)
+def make_qr(url: str, fmt: str = "png", level: str = "H", box: int = 10,
+            border: int = 4, fill: str = "#0b132b", back: str = "white") -> bytes:
+    """QR bytes — (url, format, level, size, colors) same ho to cache se.
+
+    ``box`` PNG mein pixels per module, SVG/PDF mein points per module.
+    """
+    return _WRITERS[fmt](qr_matrix(url, level), box, border, fill, back)
+
+def make_qr_batch(urls: dict, fmt: str = "png", **style) -> dict:
+    """Bohot saare QR ek call mein — {label: url} se {label: bytes}.
+
+    Jaise har category / venue ka alag form link.
+    """
+    return {label: make_qr(url, fmt, **style) for label, url in urls.items()}
+
+# ─────────────────────────────────────────────────────────────────
+#  VERIFY ID  (har certificate ki signed ID)
+# ─────────────────────────────────────────────────────────────────
+SECRET_FILE = "cert_secret.key"     # pehli baar khud banti hai — isko share mat karo
+VERIFY_QR_LEVEL = "M"               # certificate par chhota QR — M kaafi hai
+_secret = None
+
+def cert_secret() -> bytes:
+    """Signing key — env CERT_SECRET, warna SECRET_FILE (nahi hai to bana do)."""
+    global _secret
+    if _secret is None:
+        env = os.environ.get("CERT_SECRET")
+        if env:
+            _secret = env.encode()
+        else:
+            if not os.path.exists(SECRET_FILE):
+                # Poori key temp file mein, phir link — doosra thread / process kabhi
+                # aadhi-likhi (khaali) file nahi padhta; do ek saath banayein to
+                # pehla jeetta hai, dusra wahi key padhta hai.
+                tmp = f"{SECRET_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
+                fd  = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        f.write(secrets.token_bytes(32))
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.link(tmp, SECRET_FILE)
+                except FileExistsError:
+                    pass
+                finally:
+                    os.remove(tmp)
+            with open(SECRET_FILE, "rb") as f:
+                _secret = f.read()
+    return _secret
+
+def cert_id(event: str, roll_no: str) -> str:
+    """(event, roll_no) ki 16-character ID — HMAC-SHA256, base32 (80 bit).
+
+    Wahi normalization jo duplicate check mein hai, taake ek attendee ki
+    ek hi ID ho.
+    """
+    msg = " ".join(event.split()).casefold() + "\0" + " ".join(roll_no.split()).upper()
+    mac = hmac.new(cert_secret(), msg.encode(), hashlib.sha256).digest()
+    return base64.b32encode(mac[:10]).decode()
+
+def verify_url(app_url: str, cid: str) -> str:
+    """QR mein jane wala text — app URL ho to verify link, warna sirf ID."""
+    return f"{app_url.rstrip('/')}/?page=verify&id={cid}" if app_url else cid
@@ -0,0 +1,507 @@
+"""
+Registration store — CSV file (ya SQLite) + in-memory index, har event alag.
+
+Har event ka apna partition hai (event ID se): apni CSV / DB aur apna
+index. Load, export aur generate sirf active event ki files chhote hain —
+purane events jitne bhi jama hon, naye event ki speed wahi rehti hai.
+"default" event purani jagah (root ki registrations.csv / .db) use karta
+hai, baaki events EVENTS_DIR/<event_id>/ mein.
+
+Streamlit har rerun par app.py dobara chalata hai; yeh module ek hi baar
+import hota hai, is liye parsed rows reruns ke beech yahin zinda rehti hain.
+Pehli load par poora data parha jata hai, uske baad sirf jo pichli read ke
+baad add hua (CSV mein naye bytes, SQLite mein naye ids).
+
+Backend:  REG_BACKEND=sqlite  environment variable se SQLite (WAL) — bohot
+saare students ek saath submit karein tab bhi rows safe rehti hain.
+
+Writes ek background writer thread karta hai: rush ke waqt jitne submits
+queue mein jama hon woh ek hi fsync / transaction mein likhe jate hain.
+save_registration tab tak wapas nahi aata jab tak row disk par na ho.
+
+Har (event, roll_no) sirf ek baar: index O(1) mein duplicate pakarta hai.
+Policy "reject" = dobara submit save hi nahi hota, "upsert" = naya data
+purani row ki jagah le leta hai.
+"""
+
+import io, csv, os, re, sqlite3, threading, queue, time, atexit, bisect
+
+# ─────────────────────────────────────────────────────────────────
+#  FILE PATHS  (server par save hote hain)
+# ─────────────────────────────────────────────────────────────────
+DATA_FILE   = "registrations.csv"   # har event ki registrations (event folder mein)
+DB_FILE     = "registrations.db"    # REG_BACKEND=sqlite ho to yahan
+
+EVENTS_DIR    = "events"            # events/<event_id>/registrations.csv, config.json ...
+DEFAULT_EVENT = "default"           # purana single-event data — root ki files
+EVENT_ID_RE   = re.compile(r"[a-z0-9][a-z0-9-]{0,47}")
+
+BACKEND     = os.environ.get("REG_BACKEND", "csv").strip().lower()   # "csv" ya "sqlite"
+
+CSV_HEADERS = ["name","roll_no","department","batch","category","event","date","time"]
+
+# ─────────────────────────────────────────────────────────────────
+#  EVENTS  (partitions)
+# ─────────────────────────────────────────────────────────────────
+def event_path(event_id: str, filename: str) -> str:
+    """Event ki file ka path — ghalat ID (URL se aayi ho) par ValueError."""
+    if not isinstance(event_id, str) or not EVENT_ID_RE.fullmatch(event_id):
+        raise ValueError(f"Ghalat event ID: {event_id!r}")
+    if event_id == DEFAULT_EVENT:
+        return filename
+    return os.path.join(EVENTS_DIR, event_id, filename)
+
+def event_exists(event_id: str) -> bool:
+    try:
+        return event_id == DEFAULT_EVENT or os.path.isdir(event_path(event_id, ""))
+    except ValueError:
+        return False
+
+def list_events() -> list:
+    """Sab event IDs — default pehle, baaki naam ke order mein."""
+    try:
+        names = sorted(os.listdir(EVENTS_DIR))
+    except OSError:
+        names = []
+    return [DEFAULT_EVENT] + [n for n in names if n != DEFAULT_EVENT and event_exists(n)]
+
+def create_event(name: str) -> str:
+    """Naye event ka folder banao — ID naam se (URL mein jati hai), pehle se ho to -2, -3..."""
+    slug = re.sub(r"[^a-z0-9]+", "-", name.casefold()).strip("-")[:40].strip("-") or "event"
+    os.makedirs(EVENTS_DIR, exist_ok=True)
+    for n in range(1, 10_000):
+        eid = slug if n == 1 else f"{slug}-{n}"
+        if eid == DEFAULT_EVENT:
+            continue
+        try:
+            os.mkdir(event_path(eid, ""))
+            return eid
+        except FileExistsError:
+            continue
+    raise RuntimeError(f"{name!r} ke liye event ID nahi bani")
+
+# ─────────────────────────────────────────────────────────────────
+#  IN-MEMORY INDEX  (har event ka alag)
+# ─────────────────────────────────────────────────────────────────
+_lock   = threading.Lock()          # Streamlit sessions alag threads mein chalti hain
+_stores = {}                        # event_id -> index
+
+def _new_index(event_id: str) -> dict:
+    return {
+        "id":     event_id,
+        "file":   None,             # CSV: (st_dev, st_ino), SQLite: clear generation
+        "offset": 0,                # CSV: parsed bytes, SQLite: aakhri id
+        "fields": None,             # CSV header
+        "rows":   [],               # registrations, file order mein — har key ek baar
+        "keys":   {},               # (event, roll_no) -> rows mein position
+        "cats":   {},               # category -> positions (barhte order mein) — counts / filter
+        "text":   [],               # har position ka search text (name, roll no, department)
+        "version": 0,               # rows badlein (add / upsert / clear) to +1 — kabhi peeche nahi
+        "hits":   (None, None),     # (version, category, search) -> matching positions
+    }
+
+DUP_POLICIES = {
+    "reject": "🚫 Reject — dobara registration save nahi hoti",
+    "upsert": "🔁 Update — naya data purani entry ki jagah",
+}
+
+def reg_key(rec: dict):
+    """(event, roll_no) — case/space ka farq nahi. Roll No khaali ho to None."""
+    roll = " ".join((rec.get("roll_no") or "").split()).upper()
+    if not roll:
+        return None
+    return " ".join((rec.get("event") or "").split()).casefold(), roll
+
+def _store(event_id: str) -> dict:
+    ix = _stores.get(event_id)
+    if ix is None:
+        event_path(event_id, "")            # ID check
+        ix = _stores[event_id] = _new_index(event_id)
+    return ix
+
+def _reset(ix: dict, file_id=None):
+    ix.update(file=file_id, offset=0, fields=None, rows=[], keys={}, cats={}, text=[],
+              version=ix["version"] + 1)
+
+def _search_text(row: dict) -> str:
+    return "\x1f".join(row.get(f) or "" for f in ("name", "roll_no", "department")).casefold()
+
+def _add_rows(ix: dict, rows):
+    """Rows index mein jodo — same key dobara aaye to purani row ki jagah (upsert)."""
+    out, keys, cats, text = ix["rows"], ix["keys"], ix["cats"], ix["text"]
+    changed = False
+    for row in rows:
+        changed = True
+        k   = reg_key(row)
+        cat = row.get("category") or ""
+        pos = keys.get(k) if k is not None else None
+        if pos is None:
+            if k is not None:
+                keys[k] = len(out)
+            cats.setdefault(cat, []).append(len(out))
+            out.append(row)
+            text.append(_search_text(row))
+            continue
+        old = out[pos].get("category") or ""
+        if old != cat:                          # upsert mein category badli
+            cats[old].remove(pos)
+            if not cats[old]:
+                del cats[old]
+            bisect.insort(cats.setdefault(cat, []), pos)
+        out[pos], text[pos] = row, _search_text(row)
+    if changed:
+        ix["version"] += 1
+
+def _read_tail(ix: dict, path: str):
+    """Pichle offset se aage ki poori lines parse karke rows mein jodo."""
+    with open(path, "rb") as f:
+        f.seek(ix["offset"])
+        chunk = f.read()
+    end = chunk.rfind(b"\n") + 1    # adhuri aakhri line (writer beech mein ho) agli baar
+    if not end:
+        return
+    text   = io.StringIO(chunk[:end].decode("utf-8"), newline="")
+    reader = csv.DictReader(text, fieldnames=ix["fields"])
+    _add_rows(ix, reader)
+    ix["fields"] = reader.fieldnames
+    ix["offset"] += end
+
+# ─────────────────────────────────────────────────────────────────
+#  CSV BACKEND
+# ─────────────────────────────────────────────────────────────────
+def _csv_save_many(path: str, recs: list):
+    file_exists = os.path.exists(path)
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_HEADERS)
+        if not file_exists:
+            writer.writeheader()
+        writer.writerows({k: rec.get(k, "") for k in CSV_HEADERS} for rec in recs)
+        f.flush()
+        os.fsync(f.fileno())
+
+def _csv_refresh(ix: dict):
+    path = event_path(ix["id"], DATA_FILE)
+    try:
+        info = os.stat(path)
+    except OSError:
+        _reset(ix)
+        return
+    file_id = (info.st_dev, info.st_ino)
+    if ix["file"] != file_id or info.st_size < ix["offset"]:
+        _reset(ix, file_id)         # file delete/replace ya truncate hui
+    if info.st_size > ix["offset"]:
+        _read_tail(ix, path)
+
+def _csv_clear(ix: dict):
+    path = event_path(ix["id"], DATA_FILE)
+    if os.path.exists(path):
+        os.remove(path)
+
+# ─────────────────────────────────────────────────────────────────
+#  SQLITE BACKEND  (WAL — concurrent writers safe)
+# ─────────────────────────────────────────────────────────────────
+# Har process mein har DB ka ek hi connection — Streamlit har rerun naye thread par
+# chalata hai, thread-local connection har rerun par schema / import (write lock) dohrata.
+_db_lock = threading.RLock()        # connection ek waqt mein ek hi thread use kare
+_cons    = {}                       # (pid, abspath) -> connection
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS registrations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    {", ".join(f"{c} TEXT NOT NULL DEFAULT ''" for c in CSV_HEADERS)}
+);
+CREATE INDEX IF NOT EXISTS idx_reg_roll_no  ON registrations(roll_no);
+CREATE INDEX IF NOT EXISTS idx_reg_category ON registrations(category);
+CREATE INDEX IF NOT EXISTS idx_reg_event_roll ON registrations(event, roll_no);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+_INSERT = (f"INSERT INTO registrations ({','.join(CSV_HEADERS)}) "
+           f"VALUES ({','.join('?' * len(CSV_HEADERS))})")
+
+def _db(event_id: str) -> sqlite3.Connection:
+    """Event DB ka process-wide connection — ``_db_lock`` ke andar call karo.
+
+    Pehli baar (is process mein) schema + purani CSV ka import, phir kabhi nahi.
+    """
+    path = os.path.abspath(event_path(event_id, DB_FILE))
+    con  = _cons.get((os.getpid(), path))      # fork hua ho to naya connection
+    if con is None:
+        con = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA synchronous=FULL")   # WAL + NORMAL commit par fsync nahi karta
+        con.executescript(_SCHEMA)
+        _import_csv(con, event_path(event_id, DATA_FILE))
+        _cons[(os.getpid(), path)] = con
+    return con
+
+def _import_csv(con: sqlite3.Connection, csv_path: str):
+    """Purani registrations.csv ek hi baar DB mein copy karo (CSV file waisi hi rehti hai)."""
+    con.execute("BEGIN IMMEDIATE")
+    try:
+        done = con.execute("SELECT 1 FROM meta WHERE key='csv_imported'").fetchone()
+        if not done and os.path.exists(csv_path):
+            with open(csv_path, "r", encoding="utf-8", newline="") as f:
+                con.executemany(_INSERT, ([row.get(k) or "" for k in CSV_HEADERS]
+                                          for row in csv.DictReader(f)))
+        con.execute("INSERT OR IGNORE INTO meta VALUES ('csv_imported', '1')")
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+
+def _generation(con: sqlite3.Connection) -> str:
+    row = con.execute("SELECT value FROM meta WHERE key='generation'").fetchone()
+    return row[0] if row else "0"
+
+def _sql_save_many(event_id: str, recs: list):
+    with _db_lock:
+        con = _db(event_id)
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            con.executemany(_INSERT, ([rec.get(k, "") for k in CSV_HEADERS] for rec in recs))
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+
+def _sql_refresh(ix: dict):
+    with _db_lock:
+        con  = _db(ix["id"])
+        gen  = ("sqlite", os.path.abspath(event_path(ix["id"], DB_FILE)), _generation(con))
+        rows = con.execute(f"SELECT id, {','.join(CSV_HEADERS)} FROM registrations "
+                           f"WHERE id > ? ORDER BY id",
+                           (ix["offset"] if ix["file"] == gen else 0,)).fetchall()
+    if ix["file"] != gen:
+        _reset(ix, gen)             # clear hua (kisi bhi process mein) ya DB badla
+    if rows:
+        _add_rows(ix, (dict(zip(CSV_HEADERS, row[1:])) for row in rows))
+        ix["offset"] = rows[-1][0]
+
+def _sql_clear(ix: dict):
+    with _db_lock:
+        con = _db(ix["id"])
+        con.execute("BEGIN IMMEDIATE")
+        con.execute("DELETE FROM registrations")
+        con.execute("INSERT INTO meta VALUES ('generation', '1') ON CONFLICT(key) "
+                    "DO UPDATE SET value = CAST(value AS INTEGER) + 1")
+        con.execute("COMMIT")
+
+# ─────────────────────────────────────────────────────────────────
+#  WRITE QUEUE  (submits group mein flush hote hain)
+# ─────────────────────────────────────────────────────────────────
+FLUSH_MAX_ROWS = 64                 # itni rows jama hon to foran flush
+FLUSH_MAX_WAIT = 0.01               # ya pehli row ko itne second ho jayein
+write_stats    = {"batches": 0, "rows": 0}
+
+_queue        = queue.Queue()       # [rec, done Event, error, policy, saved, event_id]
+_writer       = None
+_writer_lock  = threading.Lock()
+
+def _refresh(ix: dict):
+    """Index ko storage ke barabar lao (sirf naye rows parhe jate hain)."""
+    if BACKEND == "sqlite":
+        _sql_refresh(ix)
+    else:
+        _csv_refresh(ix)
+
+def _synced(event_id: str) -> dict:
+    """Event ka index, storage ke barabar — ``_lock`` ke andar call karo."""
+    ix = _store(event_id)
+    try:
+        _refresh(ix)
+    except Exception:
+        _reset(ix)
+    return ix
+
+def _drop_duplicates(event_id: str, batch: list) -> list:
+    """'reject' policy wale items jinki key pehle se hai (ya isi batch mein) nikal do."""
+    keep, seen = [], set()
+    with _lock:
+        ix = _store(event_id)
+        _refresh(ix)
+        keys = ix["keys"]
+        for item in batch:
+            k = reg_key(item[0])
+            if k is not None and item[3] == "reject" and (k in keys or k in seen):
+                item[4] = False
+                continue
+            if k is not None:
+                seen.add(k)
+            keep.append(item)
+    return keep
+
+def _write_batch(batch: list):
+    groups = {}                     # har event ki rows uski apni file mein
+    for item in batch:
+        groups.setdefault(item[5], []).append(item)
+    for event_id, items in groups.items():
+        try:
+            recs = [item[0] for item in _drop_duplicates(event_id, items)]
+            if recs:
+                if BACKEND == "sqlite":
+                    _sql_save_many(event_id, recs)
+                else:
+                    _csv_save_many(event_path(event_id, DATA_FILE), recs)
+                write_stats["batches"] += 1
+                write_stats["rows"]    += len(recs)
+        except Exception as e:
+            for item in items:
+                item[2] = e
+    for item in batch:
+        item[1].set()
+        _queue.task_done()
+
+def _writer_loop():
+    stop = False
+    while not stop:
+        first = _queue.get()
+        if first is None:
+            _queue.task_done()
+            return
+        batch    = [first]
+        deadline = time.monotonic() + FLUSH_MAX_WAIT
+        while len(batch) < FLUSH_MAX_ROWS:
+            left = deadline - time.monotonic()
+            try:
+                item = _queue.get(timeout=left) if left > 0 else _queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                _queue.task_done()
+                stop = True
+                break
+            batch.append(item)
+        _write_batch(batch)
+
+def _ensure_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None or not _writer.is_alive():
+            _writer = threading.Thread(target=_writer_loop, name="reg-writer", daemon=True)
+            _writer.start()
+
+def flush():
+    """Queue mein jo bhi hai uske disk par likhe jane ka intezar karo."""
+    _queue.join()
+
+@atexit.register
+def shutdown():
+    """Process band hone se pehle queue khaali karo, phir writer roko."""
+    global _writer
+    with _writer_lock:
+        if _writer is not None and _writer.is_alive():
+            _queue.put(None)
+            _writer.join()
+        _writer = None
+
+# ─────────────────────────────────────────────────────────────────
+#  DATABASE FUNCTIONS  (app yahi use karta hai — har function ek event ka)
+# ─────────────────────────────────────────────────────────────────
+def save_registration(rec: dict, on_duplicate: str = "upsert",
+                      event_id: str = DEFAULT_EVENT) -> bool:
+    """Ek registration save karo — writer queue ke zariye.
+
+    Wapas tab aata hai jab row disk par flush ho chuki ho (CSV fsync ya
+    SQLite commit), is liye confirmation screen dikhana safe hai.
+    ``on_duplicate="reject"`` par agar (event, roll_no) pehle se hai to kuch
+    save nahi hota aur False milta hai.
+    """
+    event_path(event_id, "")                # ghalat ID queue tak na pohnche
+    _ensure_writer()
+    item = [rec, threading.Event(), None, on_duplicate, True, event_id]
+    _queue.put(item)
+    item[1].wait()
+    if item[2] is not None:
+        raise item[2]
+    return item[4]
+
+def is_registered(event: str, roll_no: str, event_id: str = DEFAULT_EVENT) -> bool:
+    """Yeh roll no is event mein pehle se hai? — O(1) index lookup."""
+    k = reg_key({"event": event, "roll_no": roll_no})
+    with _lock:
+        return k is not None and k in _synced(event_id)["keys"]
+
+def load_registrations(event_id: str = DEFAULT_EVENT) -> list:
+    """Event ki sab registrations (har event + roll no ek baar) — index se;
+    storage se sirf naye rows parhe jate hain."""
+    with _lock:
+        return list(_synced(event_id)["rows"])
+
+def clear_registrations(event_id: str = DEFAULT_EVENT):
+    """Event ka sab data delete karo — dusre events waise hi rehte hain."""
+    flush()
+    with _lock:
+        ix = _store(event_id)
+        if BACKEND == "sqlite":
+            _sql_clear(ix)
+        else:
+            _csv_clear(ix)
+        _reset(ix)
+
+# ─────────────────────────────────────────────────────────────────
+#  QUERY  (Registered Data table — sirf ek page bahar jata hai)
+# ─────────────────────────────────────────────────────────────────
+QUERY_PAGE = 50
+
+def category_counts(event_id: str = DEFAULT_EVENT) -> dict:
+    """{category: registrations} — index ke saath hi update hota hai, scan nahi."""
+    with _lock:
+        return {cat: len(pos) for cat, pos in _synced(event_id)["cats"].items()}
+
+def query_registrations(category=None, search: str = "", page: int = 1,
+                        per_page: int = QUERY_PAGE, event_id: str = DEFAULT_EVENT):
+    """Category filter + search ke baad ek page — (rows, total matches).
+
+    Search name / roll no / department mein (case ka farq nahi). Category
+    filter precomputed positions se; matches store version par memo hote
+    hain, is liye page badalne par dobara scan nahi. ``page`` range se
+    bahar ho to aakhri page.
+    """
+    needle = " ".join(search.split()).casefold()
+    with _lock:
+        ix   = _synced(event_id)
+        rows = ix["rows"]
+        if not category and not needle:
+            hits = None
+            total = len(rows)
+        else:
+            key = (ix["version"], category, needle)
+            if ix["hits"][0] != key:
+                pos = ix["cats"].get(category, []) if category else range(len(rows))
+                if needle:
+                    text = ix["text"]
+                    pos  = [i for i in pos if needle in text[i]]
+                ix["hits"] = (key, list(pos))
+            hits  = ix["hits"][1]
+            total = len(hits)
+        page  = min(max(page, 1), max(-(-total // per_page), 1))
+        start = (page - 1) * per_page
+        if hits is None:
+            return rows[start:start + per_page], total
+        return [rows[i] for i in hits[start:start + per_page]], total
+
+# ─────────────────────────────────────────────────────────────────
+#  EXPORTS  (store version par memo)
+# ─────────────────────────────────────────────────────────────────
+def store_version(event_id: str = DEFAULT_EVENT) -> int:
+    """Registrations ka version — data badla ho to naya number (exports ki cache key)."""
+    with _lock:
+        return _synced(event_id)["version"]
+
+_exports: dict = {}                 # (event_id, name) -> (version, key, result) — har export ka aakhri
+
+def cached_export(name: str, build, key=(), event_id: str = DEFAULT_EVENT):
+    """build(rows) ka result — store version aur ``key`` wahi hon to dobara nahi banta.
+
+    Rows aur version ek saath (lock mein) liye jate hain, to result kabhi
+    purane version ke naam par naya data nahi hota.
+    """
+    with _lock:
+        ix = _synced(event_id)
+        version, rows = ix["version"], list(ix["rows"])
+    hit = _exports.get((event_id, name))
+    if hit is not None and hit[:2] == (version, key):
+        return hit[2]
+    result = build(rows)
+    _exports[(event_id, name)] = (version, key, result)
+    return result